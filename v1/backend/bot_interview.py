@@ -4,19 +4,151 @@ Real-time Interview Bot - Conducts a full interview without intermediate feedbac
 import asyncio
 import json
 import os
-from typing import List, Dict
+import re
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from loguru import logger
-import aiohttp
 from dotenv import load_dotenv
 
+from history import ConversationHistory
+from llm_client import AzureOpenAIError, get_llm_client
+
 load_dotenv()
 
+# A sentence ends at ., ! or ? (optionally followed by quotes/brackets) plus whitespace
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+|(?<=[.!?]["\')\]])\s+')
+
+
+def split_sentences(text: str) -> Tuple[List[str], str]:
+    """Split streamed text into complete sentences and the unfinished remainder"""
+    parts = SENTENCE_END.split(text)
+    remainder = parts.pop()
+    return [p.strip() for p in parts if p.strip()], remainder
+
+
+ANSWER_EVALUATION_PROMPT = """Evaluate this single interview answer.
+
+Question: {question}
+Answer: {answer}
+
+Reply with JSON only, in this format:
+{{
+    "language_use": {{
+        "score": <number 0-100>,
+        "feedback": "<one sentence on vocabulary, grammar, fluency, clarity>",
+        "strengths": ["<short strength>"],
+        "improvements": ["<short improvement>"]
+    }},
+    "answer_quality": {{
+        "score": <number 0-100>,
+        "feedback": "<one sentence on relevance, completeness, depth, structure>",
+        "strengths": ["<short strength>"],
+        "improvements": ["<short improvement>"]
+    }}
+}}"""
+
+SUMMARY_SYNTHESIS_PROMPT = """You are an expert interview evaluator. These are per-answer evaluation notes from one interview.
+
+Average scores: language use {language_score}/100, answer quality {answer_score}/100
+
+Language use notes:
+{language_notes}
+
+Answer quality notes:
+{answer_notes}
+
+Write the final feedback as JSON only, in this format:
+{{
+    "language_feedback": "<2-3 sentences on vocabulary, grammar, fluency, clarity>",
+    "answer_feedback": "<2-3 sentences on relevance, completeness, depth, structure>",
+    "detailed_feedback": "<overall comprehensive feedback paragraph>",
+    "key_takeaways": ["<takeaway1>", "<takeaway2>", "<takeaway3>"]
+}}
+
+Be specific, constructive, and encouraging in your feedback."""
+
+
+# One prompt per summary section, issued concurrently in fan-out mode
+SUMMARY_SECTION_PROMPTS = {
+    "language_use": """Evaluate the candidate's language use in this interview transcript.
+
+Interview Transcript:
+{qa_text}
+
+Reply with JSON only, in this format:
+{{
+    "score": <number 0-100>,
+    "feedback": "<detailed feedback on vocabulary, grammar, fluency, clarity>",
+    "strengths": ["<strength1>", "<strength2>"],
+    "improvements": ["<improvement1>", "<improvement2>"]
+}}""",
+    "answer_quality": """Evaluate the quality of the candidate's answers in this interview transcript.
+
+Interview Transcript:
+{qa_text}
+
+Reply with JSON only, in this format:
+{{
+    "score": <number 0-100>,
+    "feedback": "<detailed feedback on relevance, completeness, depth, structure>",
+    "strengths": ["<strength1>", "<strength2>"],
+    "improvements": ["<improvement1>", "<improvement2>"]
+}}""",
+    "detailed_feedback": """Write one comprehensive feedback paragraph for the candidate in this interview transcript.
+Be specific, constructive, and encouraging. Reply with the paragraph only.
+
+Interview Transcript:
+{qa_text}""",
+    "key_takeaways": """List the three most important takeaways for the candidate in this interview transcript.
+
+Interview Transcript:
+{qa_text}
+
+Reply with a JSON array of three short strings only.""",
+}
+
+
+def parse_json_reply(text: str) -> Dict:
+    """Parse JSON from an AI reply, removing markdown code blocks if present"""
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+    return json.loads(text)
+
+
+def fallback_summary(detailed_feedback: str) -> Dict:
+    """Default summary structure used when the AI reply cannot be parsed"""
+    return {
+        "overall_score": 75,
+        "language_use": {
+            "score": 75,
+            "feedback": "Good communication overall.",
+            "strengths": ["Clear expression"],
+            "improvements": ["Continue practicing"]
+        },
+        "answer_quality": {
+            "score": 75,
+            "feedback": "Satisfactory answers provided.",
+            "strengths": ["Relevant responses"],
+            "improvements": ["More detail could help"]
+        },
+        "detailed_feedback": detailed_feedback,
+        "key_takeaways": ["Keep practicing", "Good effort overall"]
+    }
+
+
+def _unique(items: List[str], limit: int) -> List[str]:
+    """First `limit` distinct non-empty strings, in order"""
+    seen = []
+    for item in items:
+        if isinstance(item, str) and item.strip() and item not in seen:
+            seen.append(item)
+    return seen[:limit]
+
+
 class InterviewBot:
     def __init__(self, interview_setup=None):
-        self.api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        self.endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        self.deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
-        self.api_version = os.getenv("AZURE_OPENAI_API_VERSION")
+        self.llm = get_llm_client()
         self.interview_setup = interview_setup or {}
         
         # Customize questions based on setup
@@ -47,9 +179,25 @@ class InterviewBot:
         self.questions.append("Where do you see yourself in five years?")
         
         self.current_question_index = 0
-        self.conversation_history = []
+        self.conversation_history = ConversationHistory(
+            self._build_system_prompt(),
+            max_prompt_tokens=int(os.getenv("INTERVIEW_MAX_PROMPT_TOKENS", 3000)),
+            keep_turns=int(os.getenv("HISTORY_KEEP_TURNS", 4)),
+            llm=self.llm,
+        )
         self.qa_pairs = []  # Store all Q&A pairs for final analysis
         
+        # Score each answer in the background so the final summary is cheap
+        self.incremental_evaluation = os.getenv("INTERVIEW_INCREMENTAL_EVAL", "true").lower() == "true"
+        self.evaluation_wait_secs = float(os.getenv("INTERVIEW_EVAL_WAIT_SECS", 15))
+        # Evaluations still missing at the end are redone inline, up to this many
+        self.max_missing_evaluations = int(os.getenv("INTERVIEW_EVAL_MAX_MISSING", 2))
+        self.evaluation_tasks: List[asyncio.Task] = []
+        
+        # Generate summary sections as concurrent requests
+        self.summary_fanout = os.getenv("INTERVIEW_SUMMARY_FANOUT", "true").lower() == "true"
+        self.section_timeout_secs = float(os.getenv("INTERVIEW_SECTION_TIMEOUT_SECS", 20))
+        
     def get_next_question(self) -> str:
         """Get the next interview question"""
         if self.current_question_index < len(self.questions):
@@ -58,19 +206,12 @@ class InterviewBot:
             return question
         return None
     
-    async def get_ai_response(self, user_message: str) -> str:
-        """Get response from Azure OpenAI"""
-        try:
-            # Add user message to history
-            self.conversation_history.append({
-                "role": "user",
-                "content": user_message
-            })
-            
-            # Build system prompt for interviewer behavior with context
-            context_info = ""
-            if self.interview_setup:
-                context_info = f"""
+    def _build_system_prompt(self) -> str:
+        """Build the interviewer system prompt from the setup context"""
+        # Build system prompt for interviewer behavior with context
+        context_info = ""
+        if self.interview_setup:
+            context_info = f"""
 Interview Context:
 - Job Title: {self.interview_setup.get('jobTitle', 'Not specified')}
 - Company: {self.interview_setup.get('company', 'Not specified')}
@@ -79,8 +220,8 @@ Interview Context:
 - Focus Areas: {', '.join(self.interview_setup.get('focusAreas', [])) if self.interview_setup.get('focusAreas') else 'General'}
 
 """
-            
-            system_prompt = f"""{context_info}You are a professional job interviewer conducting a realistic behavioral interview. 
+        
+        system_prompt = f"""{context_info}You are a professional job interviewer conducting a realistic behavioral interview. 
 Your role is to:
 - Ask questions naturally and professionally
 - Listen to candidate responses without excessive praise
@@ -94,58 +235,84 @@ Your role is to:
 - DO NOT ask about job title, company, or background already provided in context
 
 Keep your responses concise, neutral, and professional, as if in a real corporate interview."""
+        
+        return system_prompt
+    
+    async def get_ai_response(self, user_message: str) -> str:
+        """Get response from Azure OpenAI"""
+        try:
+            # Add user message to history
+            self.conversation_history.append({
+                "role": "user",
+                "content": user_message
+            })
             
-            messages = [{"role": "system", "content": system_prompt}] + self.conversation_history
-            
-            # Check if using API Management endpoint
-            is_api_management = "azure-api.net" in self.endpoint
+            messages = self.conversation_history.messages()
             
-            if is_api_management:
-                # API Management endpoint - use direct HTTP
-                url = f"{self.endpoint}/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
-                headers = {
-                    "api-key": self.api_key,
-                    "Content-Type": "application/json"
-                }
-            else:
-                # Standard Azure OpenAI endpoint
-                url = f"{self.endpoint}/openai/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
-                headers = {
-                    "api-key": self.api_key,
-                    "Content-Type": "application/json"
-                }
+            logger.info(f"📤 Sending request to Azure OpenAI")
             
-            payload = {
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 300
-            }
+            try:
+                assistant_message = await self.llm.chat(messages, max_tokens=300, temperature=0.7)
+            except AzureOpenAIError:
+                return "I apologize, I'm having trouble connecting. Could you please repeat that?"
             
-            logger.info(f"📤 Sending request to Azure OpenAI")
+            # Add assistant response to history
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": assistant_message
+            })
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        assistant_message = result["choices"][0]["message"]["content"]
-                        
-                        # Add assistant response to history
-                        self.conversation_history.append({
-                            "role": "assistant",
-                            "content": assistant_message
-                        })
-                        
-                        logger.info(f"✅ Got response from Azure OpenAI")
-                        return assistant_message
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Azure OpenAI error {response.status}: {error_text}")
-                        return "I apologize, I'm having trouble connecting. Could you please repeat that?"
+            logger.info(f"✅ Got response from Azure OpenAI")
+            return assistant_message
                         
         except Exception as e:
             logger.error(f"❌ Error in get_ai_response: {str(e)}")
             return "I apologize for the technical difficulty. Could you please continue?"
     
+    async def stream_ai_response(self, user_message: str) -> AsyncIterator[str]:
+        """Stream the response from Azure OpenAI one sentence at a time"""
+        # Add user message to history
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+        
+        messages = self.conversation_history.messages()
+        sentences = []
+        buffer = ""
+        
+        logger.info(f"📤 Streaming request to Azure OpenAI")
+        
+        try:
+            async for delta in self.llm.stream_chat(messages, max_tokens=300, temperature=0.7):
+                buffer += delta
+                complete, buffer = split_sentences(buffer)
+                for sentence in complete:
+                    sentences.append(sentence)
+                    yield sentence
+        except AzureOpenAIError:
+            if not sentences:
+                yield "I apologize, I'm having trouble connecting. Could you please repeat that?"
+                return
+        except Exception as e:
+            logger.error(f"❌ Error in stream_ai_response: {str(e)}")
+            if not sentences:
+                yield "I apologize for the technical difficulty. Could you please continue?"
+                return
+        
+        # Flush whatever is left after the last sentence boundary
+        if buffer.strip():
+            sentences.append(buffer.strip())
+            yield buffer.strip()
+        
+        # Add assistant response to history
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": " ".join(sentences)
+        })
+        
+        logger.info(f"✅ Streamed response from Azure OpenAI")
+    
     async def start_interview(self, websocket) -> str:
         """Send initial greeting and first question"""
         job_title = self.interview_setup.get('jobTitle', 'this position')
@@ -174,11 +341,32 @@ Keep your responses concise, neutral, and professional, as if in a real corporat
         
         return full_message
     
+    def _record_answer(self, user_answer: str):
+        """Store the answer to the current question and start scoring it"""
+        if self.qa_pairs and self.qa_pairs[-1]["answer"] is None:
+            qa = self.qa_pairs[-1]
+            qa["answer"] = user_answer
+            if self.incremental_evaluation:
+                self.evaluation_tasks.append(asyncio.create_task(self.evaluate_answer(qa)))
+    
+    async def evaluate_answer(self, qa: Dict):
+        """Score a single Q&A pair and store the result on it"""
+        messages = [
+            {"role": "system", "content": "You are an expert interview evaluator providing structured JSON feedback."},
+            {"role": "user", "content": ANSWER_EVALUATION_PROMPT.format(question=qa["question"], answer=qa["answer"])}
+        ]
+        
+        try:
+            qa["evaluation"] = parse_json_reply(await self.llm.chat(messages, max_tokens=250, temperature=0.3))
+            logger.info(f"📝 Evaluated answer to: {qa['question'][:50]}...")
+        except Exception as e:
+            logger.warning(f"Could not evaluate answer: {str(e)}")
+            qa["evaluation"] = None
+    
     async def process_answer(self, user_answer: str) -> str:
         """Process user's answer and ask next question or follow-up"""
         # Store the answer to the current question
-        if self.qa_pairs and self.qa_pairs[-1]["answer"] is None:
-            self.qa_pairs[-1]["answer"] = user_answer
+        self._record_answer(user_answer)
         
         # Decide: ask follow-up or move to next question
         # For simplicity, we'll alternate: 1 answer -> next question
@@ -203,8 +391,190 @@ Keep your responses concise, neutral, and professional, as if in a real corporat
             # Interview complete
             return "Thank you for sharing your thoughts. That concludes our interview today. I'll now prepare your feedback summary."
     
+    async def process_answer_stream(self, user_answer: str) -> AsyncIterator[str]:
+        """Like process_answer, but yields the reply sentence by sentence"""
+        # Store the answer to the current question
+        self._record_answer(user_answer)
+        
+        next_question = self.get_next_question()
+        
+        if next_question:
+            has_question = False
+            async for sentence in self.stream_ai_response(user_answer):
+                has_question = has_question or "?" in sentence
+                yield sentence
+            
+            # If AI didn't naturally transition to next question, add it
+            if not has_question:
+                yield next_question
+            
+            # Store new Q&A pair
+            self.qa_pairs.append({
+                "question": next_question,
+                "answer": None
+            })
+        else:
+            # Interview complete
+            yield "Thank you for sharing your thoughts. That concludes our interview today. I'll now prepare your feedback summary."
+    
+    async def close(self):
+        """Cancel background work tied to this interview"""
+        for task in self.evaluation_tasks:
+            task.cancel()
+        await self.conversation_history.close()
+    
     async def generate_summary(self) -> Dict:
-        """Generate comprehensive feedback summary using AI"""
+        """Generate feedback summary, from per-answer evaluations when available"""
+        if self.incremental_evaluation:
+            summary = await self._aggregate_summary()
+            if summary is not None:
+                return summary
+        
+        return await self._generate_full_summary()
+    
+    async def _aggregate_summary(self) -> Optional[Dict]:
+        """Combine per-answer evaluations and add a short synthesis call"""
+        pending = [task for task in self.evaluation_tasks if not task.done()]
+        if pending:
+            logger.info(f"⏳ Waiting for {len(pending)} answer evaluation(s)...")
+            await asyncio.wait(pending, timeout=self.evaluation_wait_secs)
+        
+        answered = [qa for qa in self.qa_pairs if qa["answer"]]
+        if not answered or not await self._complete_evaluations(answered):
+            return None
+        evaluations = [qa["evaluation"] for qa in answered]
+        
+        summary = fallback_summary("")
+        notes = {}
+        for key in ("language_use", "answer_quality"):
+            sections = [e.get(key) or {} for e in evaluations]
+            scores = [s["score"] for s in sections if isinstance(s.get("score"), (int, float))]
+            notes[key] = [s["feedback"] for s in sections if s.get("feedback")]
+            
+            if scores:
+                summary[key]["score"] = round(sum(scores) / len(scores))
+            if notes[key]:
+                summary[key]["feedback"] = " ".join(notes[key])
+            summary[key]["strengths"] = _unique(
+                [item for s in sections for item in s.get("strengths") or []], 3
+            ) or summary[key]["strengths"]
+            summary[key]["improvements"] = _unique(
+                [item for s in sections for item in s.get("improvements") or []], 3
+            ) or summary[key]["improvements"]
+        
+        summary["overall_score"] = round(
+            (summary["language_use"]["score"] + summary["answer_quality"]["score"]) / 2
+        )
+        summary["detailed_feedback"] = summary["answer_quality"]["feedback"]
+        
+        prompt = SUMMARY_SYNTHESIS_PROMPT.format(
+            language_score=summary["language_use"]["score"],
+            answer_score=summary["answer_quality"]["score"],
+            language_notes="\n".join(f"- {n}" for n in notes["language_use"]) or "- None",
+            answer_notes="\n".join(f"- {n}" for n in notes["answer_quality"]) or "- None",
+        )
+        messages = [
+            {"role": "system", "content": "You are an expert interview evaluator providing structured JSON feedback."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        logger.info(f"📊 Synthesizing summary from {len(evaluations)} answer evaluation(s)...")
+        
+        try:
+            synthesis = parse_json_reply(await self.llm.chat(messages, max_tokens=500, temperature=0.7))
+            summary["language_use"]["feedback"] = synthesis.get("language_feedback") or summary["language_use"]["feedback"]
+            summary["answer_quality"]["feedback"] = synthesis.get("answer_feedback") or summary["answer_quality"]["feedback"]
+            summary["detailed_feedback"] = synthesis.get("detailed_feedback") or summary["detailed_feedback"]
+            summary["key_takeaways"] = synthesis.get("key_takeaways") or summary["key_takeaways"]
+        except Exception as e:
+            # Partial evaluations are still a useful summary on their own
+            logger.warning(f"Summary synthesis failed, using aggregated evaluations: {str(e)}")
+            summary["key_takeaways"] = summary["answer_quality"]["improvements"] or summary["key_takeaways"]
+        
+        logger.info("✅ Summary generated successfully")
+        return summary
+    
+    async def _complete_evaluations(self, answered: List[Dict]) -> bool:
+        """Redo evaluations that timed out or failed; False if some answers still have none"""
+        missing = [qa for qa in answered if not isinstance(qa.get("evaluation"), dict)]
+        if not missing:
+            return True
+        
+        questions = "; ".join(qa["question"][:50] for qa in missing)
+        if len(missing) > self.max_missing_evaluations:
+            logger.warning(f"{len(missing)} answer evaluation(s) missing, using the full summary: {questions}")
+            return False
+        
+        logger.warning(f"Evaluating {len(missing)} missing answer(s) inline: {questions}")
+        for task in self.evaluation_tasks:
+            task.cancel()
+        retries = [asyncio.create_task(self.evaluate_answer(qa)) for qa in missing]
+        self.evaluation_tasks.extend(retries)
+        _, pending = await asyncio.wait(retries, timeout=self.evaluation_wait_secs)
+        for task in pending:
+            task.cancel()
+        
+        if any(not isinstance(qa.get("evaluation"), dict) for qa in missing):
+            logger.warning("Some answers are still unevaluated, using the full summary")
+            return False
+        return True
+    
+    async def _generate_section(self, section: str, qa_text: str):
+        """Generate one summary section from the transcript"""
+        messages = [
+            {"role": "system", "content": "You are an expert interview evaluator providing structured feedback."},
+            {"role": "user", "content": SUMMARY_SECTION_PROMPTS[section].format(qa_text=qa_text)}
+        ]
+        max_tokens = 500 if section in ("language_use", "answer_quality") else 400
+        reply = await self.llm.chat(messages, max_tokens=max_tokens, temperature=0.7)
+        
+        if section == "detailed_feedback":
+            return reply.strip()
+        return parse_json_reply(reply)
+    
+    async def _generate_fanout_summary(self, qa_text: str) -> Dict:
+        """Generate all summary sections concurrently and merge them"""
+        sections = list(SUMMARY_SECTION_PROMPTS)
+        
+        logger.info(f"📊 Generating {len(sections)} summary sections concurrently...")
+        
+        results = await asyncio.gather(
+            *[
+                asyncio.wait_for(self._generate_section(section, qa_text), timeout=self.section_timeout_secs)
+                for section in sections
+            ],
+            return_exceptions=True
+        )
+        
+        summary = fallback_summary("")
+        failed = []
+        for section, result in zip(sections, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Summary section '{section}' failed: {type(result).__name__} {result}")
+                failed.append(section)
+            elif section in ("language_use", "answer_quality") and isinstance(result, dict):
+                # Keep the schema the frontend reads; ignore unexpected keys
+                for key in summary[section]:
+                    if result.get(key):
+                        summary[section][key] = result[key]
+                if not isinstance(summary[section]["score"], (int, float)):
+                    summary[section]["score"] = 75
+            elif section == "detailed_feedback" and result:
+                summary[section] = result
+            elif section == "key_takeaways" and isinstance(result, list) and result:
+                summary[section] = result
+        
+        if len(failed) == len(sections):
+            raise Exception("Failed to generate summary")
+        
+        summary["overall_score"] = round(
+            (summary["language_use"]["score"] + summary["answer_quality"]["score"]) / 2
+        )
+        logger.info("✅ Summary generated successfully")
+        return summary
+    
+    async def _generate_full_summary(self) -> Dict:
+        """Generate comprehensive feedback summary from the whole transcript"""
         try:
             # Build summary prompt
             qa_text = "\n\n".join([
@@ -212,6 +582,9 @@ Keep your responses concise, neutral, and professional, as if in a real corporat
                 for qa in self.qa_pairs if qa['answer']
             ])
             
+            if self.summary_fanout:
+                return await self._generate_fanout_summary(qa_text)
+            
             summary_prompt = f"""You are an expert interview evaluator. Analyze this interview transcript and provide detailed feedback.
 
 Interview Transcript:
@@ -238,71 +611,28 @@ Provide a comprehensive evaluation in the following JSON format:
 
 Be specific, constructive, and encouraging in your feedback."""
 
-            # Check if using API Management endpoint
-            is_api_management = "azure-api.net" in self.endpoint
-            
-            if is_api_management:
-                url = f"{self.endpoint}/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
-            else:
-                url = f"{self.endpoint}/openai/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
-            
-            headers = {
-                "api-key": self.api_key,
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "messages": [
-                    {"role": "system", "content": "You are an expert interview evaluator providing structured JSON feedback."},
-                    {"role": "user", "content": summary_prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 1500
-            }
+            messages = [
+                {"role": "system", "content": "You are an expert interview evaluator providing structured JSON feedback."},
+                {"role": "user", "content": summary_prompt}
+            ]
             
             logger.info("📊 Generating interview summary...")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        summary_text = result["choices"][0]["message"]["content"]
-                        
-                        # Try to parse JSON from response
-                        try:
-                            # Remove markdown code blocks if present
-                            if "```json" in summary_text:
-                                summary_text = summary_text.split("```json")[1].split("```")[0].strip()
-                            elif "```" in summary_text:
-                                summary_text = summary_text.split("```")[1].split("```")[0].strip()
-                            
-                            summary_data = json.loads(summary_text)
-                            logger.info("✅ Summary generated successfully")
-                            return summary_data
-                        except json.JSONDecodeError:
-                            logger.error("❌ Failed to parse JSON from AI response")
-                            # Return a fallback structure
-                            return {
-                                "overall_score": 75,
-                                "language_use": {
-                                    "score": 75,
-                                    "feedback": "Good communication overall.",
-                                    "strengths": ["Clear expression"],
-                                    "improvements": ["Continue practicing"]
-                                },
-                                "answer_quality": {
-                                    "score": 75,
-                                    "feedback": "Satisfactory answers provided.",
-                                    "strengths": ["Relevant responses"],
-                                    "improvements": ["More detail could help"]
-                                },
-                                "detailed_feedback": summary_text,
-                                "key_takeaways": ["Keep practicing", "Good effort overall"]
-                            }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Summary generation error {response.status}: {error_text}")
-                        raise Exception("Failed to generate summary")
+            try:
+                summary_text = await self.llm.chat(messages, max_tokens=1500, temperature=0.7)
+            except AzureOpenAIError as e:
+                logger.error(f"❌ Summary generation error {e.status}: {e.body}")
+                raise Exception("Failed to generate summary")
+            
+            # Try to parse JSON from response
+            try:
+                summary_data = parse_json_reply(summary_text)
+                logger.info("✅ Summary generated successfully")
+                return summary_data
+            except json.JSONDecodeError:
+                logger.error("❌ Failed to parse JSON from AI response")
+                # Return a fallback structure
+                return fallback_summary(summary_text)
                         
         except Exception as e:
             logger.error(f"❌ Error in generate_summary: {str(e)}")
@@ -311,6 +641,7 @@ Be specific, constructive, and encouraging in your feedback."""
 
 async def run_interview_bot(websocket):
     """Main function to run the interview bot"""
+    bot = None
     
     try:
         logger.info("🎤 Interview bot starting...")
@@ -319,9 +650,14 @@ async def run_interview_bot(websocket):
         setup_data = await websocket.receive_json()
         interview_setup = {}
         
+        # Stream replies sentence by sentence unless disabled by env or the client
+        stream_replies = os.getenv("INTERVIEW_STREAMING", "true").lower() == "true"
+        
         if setup_data.get("type") == "setup":
             interview_setup = setup_data.get("data", {})
             logger.info(f"Received interview setup: {interview_setup}")
+            if "stream" in setup_data:
+                stream_replies = bool(setup_data["stream"])
         
         # Initialize bot with setup data
         bot = InterviewBot(interview_setup)
@@ -346,14 +682,32 @@ async def run_interview_bot(websocket):
                 
                 logger.info(f"👤 User: {user_message[:50]}...")
                 
-                # Process answer and get next question
-                response = await bot.process_answer(user_message)
-                
-                # Send response
-                await websocket.send_json({
-                    "type": "ai_message",
-                    "content": response
-                })
+                if stream_replies:
+                    # Send each sentence as soon as it is ready so speech can start early
+                    sentences = []
+                    async for sentence in bot.process_answer_stream(user_message):
+                        sentences.append(sentence)
+                        await websocket.send_json({
+                            "type": "ai_sentence",
+                            "content": sentence
+                        })
+                    response = " ".join(sentences)
+                    
+                    # Full message keeps older clients working
+                    await websocket.send_json({
+                        "type": "ai_message",
+                        "content": response,
+                        "streamed": True
+                    })
+                else:
+                    # Process answer and get next question
+                    response = await bot.process_answer(user_message)
+                    
+                    # Send response
+                    await websocket.send_json({
+                        "type": "ai_message",
+                        "content": response
+                    })
                 
                 # Check if interview is complete
                 if "concludes our interview" in response.lower():
@@ -389,3 +743,6 @@ async def run_interview_bot(websocket):
             "type": "error",
             "content": "An error occurred during the interview."
         })
+    finally:
+        if bot is not None:
+            await bot.close()
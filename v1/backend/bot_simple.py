@@ -4,11 +4,13 @@ Azure OpenAI bot using WebSocket transport
 import os
 import asyncio
 import json
-import aiohttp
 from fastapi import WebSocket
 from loguru import logger
 from dotenv import load_dotenv
 
+from history import ConversationHistory
+from llm_client import AzureOpenAIError, get_llm_client
+
 # Load environment variables
 load_dotenv()
 
@@ -23,14 +25,11 @@ async def run_bot_websocket(websocket: WebSocket):
     
     logger.info("Starting bot session")
     
-    # Azure OpenAI settings (REQUIRED)
-    azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
-    azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    azure_deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
-    azure_api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+    # Shared Azure OpenAI client (REQUIRED settings are read once at startup)
+    llm = get_llm_client()
     
     # Validate Azure configuration
-    if not azure_api_key or not azure_endpoint or not azure_deployment:
+    if not llm.is_configured:
         logger.error("❌ Missing Azure OpenAI configuration in .env file")
         await websocket.send_json({
             "type": "error",
@@ -38,9 +37,9 @@ async def run_bot_websocket(websocket: WebSocket):
         })
         return
     
-    logger.info(f"✅ Using Azure OpenAI at: {azure_endpoint}")
-    logger.info(f"   Deployment: {azure_deployment}")
-    logger.info(f"   API Version: {azure_api_version}")
+    logger.info(f"✅ Using Azure OpenAI at: {llm.endpoint}")
+    logger.info(f"   Deployment: {llm.deployment}")
+    logger.info(f"   API Version: {llm.api_version}")
     
     # System prompt for interview assistant
     system_prompt = """You are an AI interview coach helping users practice for job interviews.
@@ -61,15 +60,23 @@ The user has already provided their interview context. DO NOT ask them again abo
 Instead, jump directly into asking relevant interview questions based on their background.
 Keep your responses concise and natural, as if you're in a real interview."""
     
-    # Initialize conversation history
-    conversation_history = [
-        {"role": "system", "content": system_prompt}
-    ]
+    # Initialize conversation history (token-budgeted, older turns get summarized)
+    conversation_history = ConversationHistory(
+        system_prompt,
+        max_prompt_tokens=int(os.getenv("CHAT_MAX_PROMPT_TOKENS", 3000)),
+        keep_turns=int(os.getenv("HISTORY_KEEP_TURNS", 4)),
+        llm=llm,
+    )
+    
+    # Stream replies token by token unless disabled by env or the client
+    stream_replies = os.getenv("CHAT_STREAMING", "true").lower() == "true"
     
     # Wait for initial setup data from client
     try:
         setup_data = await websocket.receive_json()
         if setup_data.get("type") == "setup":
+            if "stream" in setup_data:
+                stream_replies = bool(setup_data["stream"])
             interview_setup = setup_data.get("data", {})
             logger.info(f"Received interview setup: {interview_setup}")
             
@@ -85,7 +92,7 @@ Interview Context:
 
 Use this context to tailor your questions. Start the interview immediately with a relevant question."""
             
-            conversation_history[0]["content"] += "\n\n" + context
+            conversation_history.system_prompt += "\n\n" + context
             
             # Generate personalized first message
             initial_message = f"Hello! I see you're preparing for a {interview_setup.get('jobTitle', 'job')} interview"
@@ -125,44 +132,30 @@ Use this context to tailor your questions. Start the interview immediately with
                 
                 # Generate AI response using Azure OpenAI
                 try:
-                    # Check if using Azure API Management (azure-api.net) or direct Azure OpenAI
-                    is_api_management = "azure-api.net" in azure_endpoint
-                    
-                    if is_api_management:
-                        # Azure API Management endpoint
-                        url = f"{azure_endpoint.rstrip('/')}/openai/deployments/{azure_deployment}/chat/completions?api-version={azure_api_version}"
-                    else:
-                        # Direct Azure OpenAI endpoint
-                        url = f"{azure_endpoint.rstrip('/')}/openai/deployments/{azure_deployment}/chat/completions?api-version={azure_api_version}"
-                    
-                    headers = {
-                        "Content-Type": "application/json",
-                        "api-key": azure_api_key
-                    }
-                    
-                    payload = {
-                        "messages": conversation_history,
-                        "max_tokens": 300,
-                        "temperature": 0.7
-                    }
+                    logger.info(f"📤 Calling Azure: {llm.url}")
                     
-                    logger.info(f"📤 Calling Azure: {url}")
-                    
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(url, json=payload, headers=headers) as resp:
-                            if resp.status != 200:
-                                error_text = await resp.text()
-                                logger.error(f"❌ Azure API error ({resp.status}): {error_text}")
-                                
+                    try:
+                        if stream_replies:
+                            # Forward tokens as they arrive, then the full message below
+                            parts = []
+                            async for delta in llm.stream_chat(conversation_history.messages(), max_tokens=300, temperature=0.7):
+                                parts.append(delta)
                                 await websocket.send_json({
-                                    "type": "error",
-                                    "content": f"Azure API error: {resp.status}"
+                                    "type": "delta",
+                                    "role": "assistant",
+                                    "content": delta
                                 })
-                                continue
-                            
-                            result = await resp.json()
-                            assistant_message = result['choices'][0]['message']['content']
-                            logger.info(f"🤖 Assistant: {assistant_message}")
+                            assistant_message = "".join(parts)
+                        else:
+                            assistant_message = await llm.chat(conversation_history.messages(), max_tokens=300, temperature=0.7)
+                    except AzureOpenAIError as e:
+                        await websocket.send_json({
+                            "type": "error",
+                            "content": f"Azure API error: {e.status}"
+                        })
+                        continue
+                    
+                    logger.info(f"🤖 Assistant: {assistant_message}")
                     
                     # Add to history
                     conversation_history.append({
@@ -200,4 +193,5 @@ Use this context to tailor your questions. Start the interview immediately with
     except Exception as e:
         logger.error(f"Error in bot session: {e}")
     finally:
+        await conversation_history.close()
         logger.info("Bot session ended")
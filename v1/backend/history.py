@@ -0,0 +1,148 @@
+"""
+Token-budgeted conversation history with rolling background summarization
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from llm_client import AzureOpenAIClient, get_llm_client
+
+# Rough average for English text with the GPT tokenizers
+CHARS_PER_TOKEN = 4
+# Per-message overhead for role / separators in the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+# After a failed summarization, wait this long before trying again
+SUMMARY_RETRY_SECS = 60
+
+SUMMARY_PROMPT = """You maintain a running summary of an interview practice conversation.
+Merge the earlier summary (if any) with the new transcript lines into one concise summary.
+Keep the questions asked, the key facts the candidate shared and any open threads.
+Reply with the summary text only."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate, good enough for budgeting"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def estimate_message_tokens(message: Dict) -> int:
+    return estimate_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+
+
+class ConversationHistory:
+    """
+    Chat history that stays within a prompt token budget.
+
+    The system prompt and the last `keep_turns` user/assistant turns are always
+    sent verbatim. When the history grows past `max_prompt_tokens`, older turns
+    are folded into a running summary by a background LLM call.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        max_prompt_tokens: int = 3000,
+        keep_turns: int = 4,
+        summary_max_tokens: int = 300,
+        llm: Optional[AzureOpenAIClient] = None,
+    ):
+        self.system_prompt = system_prompt
+        self.max_prompt_tokens = max_prompt_tokens
+        self.keep_messages = keep_turns * 2
+        self.summary_max_tokens = summary_max_tokens
+        self.llm = llm or get_llm_client()
+
+        self.summary = ""
+        self._turns: List[Dict] = []
+        self._folding: List[Dict] = []  # Turns being summarized right now
+        self._summary_task: Optional[asyncio.Task] = None
+        self._summary_failed_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._folding) + len(self._turns)
+
+    def append(self, message: Dict):
+        """Add a message and schedule summarization if over budget"""
+        self._turns.append(message)
+        self._maybe_compact()
+
+    def _system_message(self) -> Dict:
+        content = self.system_prompt
+        if self.summary:
+            content += f"\n\nSummary of the earlier conversation:\n{self.summary}"
+        return {"role": "system", "content": content}
+
+    def _total_tokens(self) -> int:
+        return sum(
+            estimate_message_tokens(m)
+            for m in [self._system_message()] + self._folding + self._turns
+        )
+
+    def _maybe_compact(self):
+        if self._summary_task is not None and not self._summary_task.done():
+            return
+        # Back off after a failure; the hard cap in messages() keeps prompts in budget meanwhile
+        if (
+            self._summary_failed_at is not None
+            and time.monotonic() - self._summary_failed_at < SUMMARY_RETRY_SECS
+        ):
+            return
+        if len(self._turns) <= self.keep_messages:
+            return
+        if self._total_tokens() <= self.max_prompt_tokens:
+            return
+
+        self._folding = self._turns[:-self.keep_messages]
+        self._turns = self._turns[-self.keep_messages:]
+        self._summary_task = asyncio.create_task(self._summarize(self._folding))
+
+    async def _summarize(self, folding: List[Dict]):
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in folding)
+        prompt = f"Earlier summary:\n{self.summary or '(none)'}\n\nNew transcript lines:\n{transcript}"
+
+        try:
+            self.summary = await self.llm.chat(
+                [
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=self.summary_max_tokens,
+                temperature=0.3,
+            )
+            self._summary_failed_at = None
+            logger.info(f"🗜️ Folded {len(folding)} messages into conversation summary")
+        except Exception as e:
+            # Put the turns back so they are retried once the back-off has passed
+            logger.warning(f"Could not summarize conversation history: {e}")
+            self._turns = folding + self._turns
+            self._summary_failed_at = time.monotonic()
+        finally:
+            self._folding = []
+
+    def messages(self) -> List[Dict]:
+        """Messages to send: system prompt (+ summary) and recent turns within budget"""
+        system = self._system_message()
+        turns = self._folding + self._turns
+
+        # Hard cap while a summary is pending: drop the oldest turns, keep the latest
+        budget = self.max_prompt_tokens - estimate_message_tokens(system)
+        kept: List[Dict] = []
+        for message in reversed(turns):
+            cost = estimate_message_tokens(message)
+            if kept and cost > budget:
+                break
+            kept.append(message)
+            budget -= cost
+
+        return [system] + kept[::-1]
+
+    async def close(self):
+        """Cancel any in-flight summarization"""
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
+            try:
+                await self._summary_task
+            except asyncio.CancelledError:
+                pass
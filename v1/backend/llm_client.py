@@ -0,0 +1,225 @@
+"""
+Shared Azure OpenAI client with a pooled keep-alive HTTP session
+"""
+import os
+import json
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiohttp
+from loguru import logger
+from dotenv import load_dotenv
+
+from request_policy import RequestPolicy, parse_retry_after
+
+load_dotenv()
+
+
+class AzureOpenAIError(Exception):
+    """Raised when Azure OpenAI answers with a non-200 status"""
+
+    def __init__(self, status: int, body: str, retry_after: Optional[float] = None):
+        super().__init__(f"Azure API error: {status}")
+        self.status = status
+        self.body = body
+        self.retry_after = retry_after
+
+
+class AzureOpenAIClient:
+    """Process-wide Azure OpenAI chat client backed by one connection pool"""
+
+    def __init__(self):
+        self.api_key = os.getenv("AZURE_OPENAI_API_KEY")
+        self.endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+        self.deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
+        self.api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+
+        # Connection pool / timeout settings
+        self.pool_size = int(os.getenv("AZURE_OPENAI_POOL_SIZE", 100))
+        self.pool_per_host = int(os.getenv("AZURE_OPENAI_POOL_PER_HOST", 20))
+        self.keepalive_timeout = float(os.getenv("AZURE_OPENAI_KEEPALIVE_SECS", 60))
+        self.connect_timeout = float(os.getenv("AZURE_OPENAI_CONNECT_TIMEOUT", 10))
+        self.read_timeout = float(os.getenv("AZURE_OPENAI_READ_TIMEOUT", 60))
+
+        # URL and headers are built once instead of on every request
+        self.url = self._build_url() if self.is_configured else None
+        self.headers = {
+            "Content-Type": "application/json",
+            "api-key": self.api_key or "",
+        }
+
+        # Retries, hedging and per-deployment latency stats
+        self.policy = RequestPolicy()
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.api_key and self.endpoint and self.deployment)
+
+    def _build_url(self) -> str:
+        base = self.endpoint.rstrip("/")
+        # Same format the bots used before: API Management (azure-api.net) endpoints
+        # are used as given, direct Azure OpenAI endpoints get the /openai path
+        prefix = os.getenv("AZURE_OPENAI_PATH_PREFIX")
+        if prefix is None:
+            prefix = "" if "azure-api.net" in base else "/openai"
+        return f"{base}{prefix}/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
+
+    async def start(self):
+        """Open the pooled HTTP session"""
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        logger.info(
+            f"✅ Azure OpenAI client ready (pool={self.pool_size}, per_host={self.pool_per_host})"
+        )
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        logger.info("Azure OpenAI client closed")
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("Azure OpenAI client is not started")
+        return self._session
+
+    async def chat(
+        self,
+        messages: List[Dict],
+        max_tokens: int = 300,
+        temperature: float = 0.7,
+    ) -> str:
+        """Send a chat completion request and return the assistant message"""
+        if not self.is_configured:
+            raise RuntimeError("Missing Azure OpenAI configuration")
+        await self.start()
+
+        payload = {
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+
+        async def request_once() -> str:
+            async with self.session.post(self.url, json=payload, headers=self.headers) as resp:
+                if resp.status != 200:
+                    raise await self._error(resp)
+
+                result = await resp.json()
+                return result["choices"][0]["message"]["content"]
+
+        return await self.policy.run(self.deployment, request_once)
+
+    async def stream_chat(
+        self,
+        messages: List[Dict],
+        max_tokens: int = 300,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        """Send a streaming chat completion request and yield content deltas"""
+        if not self.is_configured:
+            raise RuntimeError("Missing Azure OpenAI configuration")
+        await self.start()
+
+        payload = {
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+        }
+
+        async def open_stream() -> aiohttp.ClientResponse:
+            resp = await self.session.post(self.url, json=payload, headers=self.headers)
+            if resp.status != 200:
+                error = await self._error(resp)
+                resp.release()
+                raise error
+            return resp
+
+        # Retries / hedging cover the time until response headers arrive
+        resp = await self.policy.run(
+            f"{self.deployment}:stream", open_stream, discard=lambda r: r.release()
+        )
+        try:
+            # Server-sent events: one "data: {...}" line per chunk
+            async for raw_line in resp.content:
+                delta = parse_sse_line(raw_line)
+                if delta is None:
+                    continue
+                if delta is STREAM_DONE:
+                    break
+                yield delta
+        finally:
+            resp.release()
+
+    @staticmethod
+    async def _error(resp: aiohttp.ClientResponse) -> AzureOpenAIError:
+        error_text = await resp.text()
+        logger.error(f"❌ Azure API error ({resp.status}): {error_text}")
+        return AzureOpenAIError(resp.status, error_text, parse_retry_after(resp.headers))
+
+
+# Sentinel returned by parse_sse_line for the final "data: [DONE]" event
+STREAM_DONE = object()
+
+
+def parse_sse_line(raw_line: bytes):
+    """Extract the content delta from one SSE line of a streaming completion"""
+    line = raw_line.decode("utf-8").strip()
+    if not line.startswith("data:"):
+        return None
+
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return STREAM_DONE
+
+    chunk = json.loads(data)
+    # Azure sends a leading chunk with prompt filter results and no choices
+    if not chunk.get("choices"):
+        return None
+    return chunk["choices"][0].get("delta", {}).get("content") or None
+
+
+# Process-wide client instance
+_client: Optional[AzureOpenAIClient] = None
+
+
+async def init_llm_client() -> AzureOpenAIClient:
+    """Create and start the shared client (called on app startup)"""
+    global _client
+    if _client is None:
+        _client = AzureOpenAIClient()
+    await _client.start()
+    return _client
+
+
+async def close_llm_client():
+    """Close the shared client (called on app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_llm_client() -> AzureOpenAIClient:
+    """Return the shared client, creating it lazily if startup did not run"""
+    global _client
+    if _client is None:
+        _client = AzureOpenAIClient()
+    return _client
@@ -0,0 +1,184 @@
+"""
+Local Azure OpenAI stand-in for offline load tests
+
+Serves /openai/deployments/{deployment}/chat/completions with a configurable
+latency distribution, SSE streaming and injected 429 / 500 errors. Replies are
+canned but shaped like what the bots expect (evaluation prompts get JSON).
+
+Usage:
+    python loadtest/fake_azure.py --port 9100 --latency-median 0.4 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+
+from aiohttp import web
+
+INTERVIEWER_REPLY = "Thank you for sharing that. I see. Could you tell me more about how you measured the results?"
+
+SECTION_REPLY = {
+    "score": 78,
+    "feedback": "Clear and well structured overall.",
+    "strengths": ["Concrete examples"],
+    "improvements": ["Quantify the impact"],
+}
+
+
+class FakeAzureConfig:
+    def __init__(
+        self,
+        latency_median: float = 0.4,
+        latency_sigma: float = 0.5,
+        token_delay: float = 0.02,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = None,
+    ):
+        self.latency_median = latency_median  # seconds to first byte (median)
+        self.latency_sigma = latency_sigma    # lognormal shape; 0 = fixed latency
+        self.token_delay = token_delay        # seconds between streamed tokens
+        self.error_rate = error_rate          # fraction of requests answered with 500
+        self.throttle_rate = throttle_rate    # fraction of requests answered with 429
+        self.retry_after = retry_after        # Retry-After sent with 429s
+        self.random = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        if self.latency_sigma <= 0:
+            return self.latency_median
+        return self.random.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+
+
+def reply_for(messages) -> str:
+    """Pick a canned reply shaped like what the calling prompt asks for"""
+    prompt = json.dumps(messages)
+    if "single interview answer" in prompt:
+        return json.dumps({"language_use": SECTION_REPLY, "answer_quality": SECTION_REPLY})
+    if "per-answer evaluation notes" in prompt:
+        return json.dumps({
+            "language_feedback": "Fluent and clear.",
+            "answer_feedback": "Relevant answers with good structure.",
+            "detailed_feedback": "A solid interview overall with room to add metrics.",
+            "key_takeaways": ["Use the STAR method", "Quantify impact", "Keep answers concise"],
+        })
+    if "three most important takeaways" in prompt:
+        return json.dumps(["Use the STAR method", "Quantify impact", "Keep answers concise"])
+    if "comprehensive feedback paragraph" in prompt and "JSON" not in prompt:
+        return "A solid interview overall with room to add metrics."
+    if "Reply with JSON only" in prompt:
+        return json.dumps(SECTION_REPLY)
+    if "JSON format" in prompt:
+        return json.dumps({
+            "overall_score": 78,
+            "language_use": SECTION_REPLY,
+            "answer_quality": SECTION_REPLY,
+            "detailed_feedback": "A solid interview overall with room to add metrics.",
+            "key_takeaways": ["Use the STAR method", "Quantify impact"],
+        })
+    if "running summary" in prompt:
+        return "The candidate described their background and recent projects."
+    return INTERVIEWER_REPLY
+
+
+def create_app(config: FakeAzureConfig) -> web.Application:
+    stats = {"requests": 0, "streams": 0, "errors": 0, "throttled": 0}
+
+    async def chat_completions(request: web.Request) -> web.StreamResponse:
+        stats["requests"] += 1
+        body = await request.json()
+
+        roll = config.random.random()
+        if roll < config.throttle_rate:
+            stats["throttled"] += 1
+            return web.json_response(
+                {"error": {"code": "429", "message": "Rate limit is exceeded."}},
+                status=429,
+                headers={"Retry-After": str(config.retry_after)},
+            )
+        if roll < config.throttle_rate + config.error_rate:
+            stats["errors"] += 1
+            await asyncio.sleep(config.sample_latency() / 2)
+            return web.json_response({"error": {"message": "Internal server error"}}, status=500)
+
+        await asyncio.sleep(config.sample_latency())
+        text = reply_for(body.get("messages", []))
+        created = int(time.time())
+
+        if not body.get("stream"):
+            return web.json_response({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": created,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            })
+
+        stats["streams"] += 1
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        # Azure opens with a prompt-filter chunk that has no choices
+        await response.write(b'data: {"id":"","object":"","created":0,"choices":[]}\n\n')
+        for token in text.split(" "):
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "choices": [{"index": 0, "delta": {"content": token + " "}, "finish_reason": None}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(config.token_delay)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app["stats"] = stats
+    app.router.add_post("/openai/deployments/{deployment}/chat/completions", chat_completions)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+async def start_fake_azure(config: FakeAzureConfig, host: str = "127.0.0.1", port: int = 9100) -> web.AppRunner:
+    """Start the fake server inside the running loop; call runner.cleanup() to stop"""
+    runner = web.AppRunner(create_app(config), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def add_fake_azure_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-median", type=float, default=0.4, help="median seconds to first byte")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="lognormal sigma (0 = fixed)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args) -> FakeAzureConfig:
+    return FakeAzureConfig(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        token_delay=args.token_delay,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Azure OpenAI stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_fake_azure_arguments(parser)
+    args = parser.parse_args()
+
+    print(f"🧪 Fake Azure OpenAI on http://{args.host}:{args.port}")
+    web.run_app(create_app(config_from_args(args)), host=args.host, port=args.port, print=None)
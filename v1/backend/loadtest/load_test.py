@@ -0,0 +1,375 @@
+"""
+Concurrent-session load test for the v1 interview server
+
+Starts the fake Azure OpenAI server and `server.py` locally (no network
+needed), opens N WebSocket sessions against /ws/interview and
+/ws/interview-realtime, replays scripted setups and answers, and reports
+turn latency percentiles, throughput and server memory.
+
+Usage (from v1/backend):
+    python loadtest/load_test.py --sessions 50 --mode both
+    python loadtest/load_test.py --sessions 20 --max-p95-ms 3000   # regression gate
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from fake_azure import add_fake_azure_arguments, config_from_args, start_fake_azure
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_SCRIPTS = [
+    {
+        "setup": {
+            "jobTitle": "Software Engineer",
+            "company": "Acme",
+            "interviewFormat": "Behavioral",
+            "experience": "3 years",
+            "focusAreas": ["technical", "communication"],
+        },
+        "answers": [
+            "I'm a backend engineer with three years of experience building Python services.",
+            "I like the role because it combines distributed systems with product work.",
+            "I rebuilt our billing pipeline, cutting processing time from hours to minutes.",
+            "I explained our caching strategy to the sales team using a library analogy.",
+            "I break work into milestones and communicate early when a deadline is at risk.",
+            "In five years I'd like to lead a platform team.",
+        ],
+    },
+    {
+        "setup": {
+            "jobTitle": "Product Manager",
+            "company": "Globex",
+            "interviewFormat": "Mixed",
+            "experience": "5 years",
+            "focusAreas": ["behavioral", "problem-solving"],
+        },
+        "answers": [
+            "I've spent five years as a product manager in B2B SaaS.",
+            "The role excites me because of the focus on customer research.",
+            "I mediated a conflict between design and engineering by reframing the goal.",
+            "I start from the customer problem, list hypotheses and test the cheapest first.",
+            "Under pressure I cut scope rather than quality.",
+            "I see myself running a product line.",
+        ],
+    },
+]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process in MB (psutil if installed, else /proc)"""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class Results:
+    def __init__(self):
+        self.turns: Dict[str, List[float]] = {"chat": [], "realtime": []}
+        self.first_token: Dict[str, List[float]] = {"chat": [], "realtime": []}
+        self.summaries: List[float] = []
+        self.errors: Dict[str, int] = {"chat": 0, "realtime": 0}
+        self.sessions_done = 0
+        self.memory: List[float] = []
+
+
+async def receive(ws: aiohttp.ClientWebSocketResponse, timeout: float) -> Dict:
+    msg = await ws.receive(timeout=timeout)
+    if msg.type != aiohttp.WSMsgType.TEXT:
+        raise ConnectionError(f"WebSocket closed ({msg.type.name})")
+    return json.loads(msg.data)
+
+
+async def run_chat_session(http, base_url, script, args, results: Results):
+    """Replay one /ws/interview session"""
+    async with http.ws_connect(f"{base_url}/ws/interview") as ws:
+        await ws.send_json({"type": "setup", "data": script["setup"]})
+        await receive(ws, args.timeout)
+
+        for answer in script["answers"][:args.turns]:
+            await asyncio.sleep(args.think)
+            start = time.monotonic()
+            first = None
+            await ws.send_json({"type": "message", "content": answer})
+            while True:
+                data = await receive(ws, args.timeout)
+                if data["type"] == "delta" and first is None:
+                    first = time.monotonic() - start
+                elif data["type"] == "message":
+                    break
+                elif data["type"] == "error":
+                    results.errors["chat"] += 1
+                    break
+            latency = time.monotonic() - start
+            results.turns["chat"].append(latency)
+            results.first_token["chat"].append(first if first is not None else latency)
+
+        await ws.send_json({"type": "end"})
+
+
+async def run_realtime_session(http, base_url, script, args, results: Results):
+    """Replay one /ws/interview-realtime session through to the summary"""
+    async with http.ws_connect(f"{base_url}/ws/interview-realtime") as ws:
+        await ws.send_json({"type": "setup", "data": script["setup"]})
+        await receive(ws, args.timeout)
+
+        concluded = False
+        for answer in script["answers"][:args.turns]:
+            await asyncio.sleep(args.think)
+            start = time.monotonic()
+            first = None
+            await ws.send_json({"type": "user_message", "content": answer})
+            while True:
+                data = await receive(ws, args.timeout)
+                if data["type"] == "ai_sentence" and first is None:
+                    first = time.monotonic() - start
+                elif data["type"] == "ai_message":
+                    concluded = "concludes our interview" in data["content"].lower()
+                    break
+                elif data["type"] == "error":
+                    results.errors["realtime"] += 1
+                    break
+            latency = time.monotonic() - start
+            results.turns["realtime"].append(latency)
+            results.first_token["realtime"].append(first if first is not None else latency)
+            if concluded:
+                break
+
+        start = time.monotonic()
+        if not concluded:
+            await ws.send_json({"type": "end_interview"})
+        while True:
+            data = await receive(ws, args.timeout)
+            if data["type"] == "interview_complete":
+                results.summaries.append(time.monotonic() - start)
+                break
+            if data["type"] == "error":
+                results.errors["realtime"] += 1
+                break
+
+
+async def run_session(index, http, base_url, args, scripts, results: Results):
+    script = scripts[index % len(scripts)]
+    kinds = ["chat", "realtime"] if args.mode == "both" else [args.mode]
+    kind = kinds[index % len(kinds)]
+
+    await asyncio.sleep(random.uniform(0, args.ramp))
+    try:
+        if kind == "chat":
+            await run_chat_session(http, base_url, script, args, results)
+        else:
+            await run_realtime_session(http, base_url, script, args, results)
+    except Exception as e:
+        results.errors[kind] += 1
+        print(f"⚠️ Session {index} ({kind}) failed: {type(e).__name__} {e}")
+    results.sessions_done += 1
+
+
+async def sample_memory(pid: Optional[int], results: Results, interval: float = 0.5):
+    if pid is None:
+        return
+    while True:
+        rss = read_rss_mb(pid)
+        if rss is not None:
+            results.memory.append(rss)
+        await asyncio.sleep(interval)
+
+
+async def wait_until_up(http, base_url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with http.get(f"{base_url}/") as resp:
+                if resp.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"Server at {base_url} did not come up")
+
+
+def fmt(value: Optional[float]) -> str:
+    return f"{value * 1000:8.0f}" if value is not None else "       -"
+
+
+def build_report(results: Results, wall_time: float, llm_stats: Dict) -> Dict:
+    report = {"wall_time_s": round(wall_time, 2), "sessions": results.sessions_done, "endpoints": {}}
+    total_turns = 0
+    for kind in ("chat", "realtime"):
+        turns = results.turns[kind]
+        if not turns and not results.errors[kind]:
+            continue
+        total_turns += len(turns)
+        report["endpoints"][kind] = {
+            "turns": len(turns),
+            "errors": results.errors[kind],
+            "turn_ms": {f"p{q}": round(percentile(turns, q) * 1000) if turns else None for q in (50, 90, 95, 99)},
+            "first_token_ms": {
+                f"p{q}": round(percentile(results.first_token[kind], q) * 1000) if turns else None
+                for q in (50, 95)
+            },
+        }
+    if results.summaries:
+        report["summary_ms"] = {f"p{q}": round(percentile(results.summaries, q) * 1000) for q in (50, 95)}
+    report["throughput_turns_per_s"] = round(total_turns / wall_time, 2) if wall_time else 0
+    if results.memory:
+        report["server_rss_mb"] = {
+            "start": round(results.memory[0], 1),
+            "peak": round(max(results.memory), 1),
+            "end": round(results.memory[-1], 1),
+        }
+    report["llm_stats"] = llm_stats
+    return report
+
+
+def print_report(report: Dict):
+    print("\n" + "=" * 60)
+    print("📈 Load test report")
+    print("=" * 60)
+    print(f"Sessions: {report['sessions']}   Wall time: {report['wall_time_s']}s   "
+          f"Throughput: {report['throughput_turns_per_s']} turns/s")
+    print(f"\n{'endpoint':<10}{'turns':>7}{'errors':>8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'ttft50':>9}")
+    for kind, stats in report["endpoints"].items():
+        t = stats["turn_ms"]
+        print(f"{kind:<10}{stats['turns']:>7}{stats['errors']:>8}"
+              f"{str(t['p50']):>9}{str(t['p90']):>9}{str(t['p95']):>9}{str(t['p99']):>9}"
+              f"{str(stats['first_token_ms']['p50']):>9}")
+    if "summary_ms" in report:
+        print(f"\nSummary latency (ms): {report['summary_ms']}")
+    if "server_rss_mb" in report:
+        print(f"Server RSS (MB): {report['server_rss_mb']}")
+    print("=" * 60)
+
+
+async def main(args) -> int:
+    scripts = DEFAULT_SCRIPTS
+    if args.script:
+        scripts = json.loads(Path(args.script).read_text())
+
+    fake_runner = None
+    server = None
+    server_pid = args.server_pid
+    base_url = args.url
+
+    if base_url is None:
+        fake_port = free_port()
+        fake_runner = await start_fake_azure(config_from_args(args), port=fake_port)
+
+        port = free_port()
+        env = dict(
+            os.environ,
+            AZURE_OPENAI_API_KEY="fake-key",
+            AZURE_OPENAI_ENDPOINT=f"http://127.0.0.1:{fake_port}",
+            AZURE_OPENAI_DEPLOYMENT_NAME="fake-deployment",
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+        server_pid = server.pid
+        base_url = f"http://127.0.0.1:{port}"
+
+    results = Results()
+    exit_code = 0
+    try:
+        timeout = aiohttp.ClientTimeout(total=None)
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as http:
+            await wait_until_up(http, base_url)
+            print(f"🚀 Running {args.sessions} session(s) against {base_url} (mode={args.mode})")
+
+            sampler = asyncio.create_task(sample_memory(server_pid, results))
+            start = time.monotonic()
+            await asyncio.gather(*[
+                run_session(i, http, base_url, args, scripts, results) for i in range(args.sessions)
+            ])
+            wall_time = time.monotonic() - start
+            sampler.cancel()
+
+            llm_stats = {}
+            try:
+                async with http.get(f"{base_url}/api/llm-stats") as resp:
+                    if resp.status == 200:
+                        llm_stats = await resp.json()
+            except aiohttp.ClientError:
+                pass
+
+        report = build_report(results, wall_time, llm_stats)
+        print_report(report)
+        if args.json:
+            Path(args.json).write_text(json.dumps(report, indent=2))
+            print(f"📝 Report written to {args.json}")
+
+        # Regression gates
+        all_turns = results.turns["chat"] + results.turns["realtime"]
+        errors = sum(results.errors.values())
+        p95 = percentile(all_turns, 95)
+        if args.max_p95_ms is not None and (p95 is None or p95 * 1000 > args.max_p95_ms):
+            print(f"❌ Turn p95 {fmt(p95).strip()}ms exceeds {args.max_p95_ms}ms")
+            exit_code = 1
+        if args.max_error_rate is not None and all_turns and errors / len(all_turns) > args.max_error_rate:
+            print(f"❌ Error rate {errors / len(all_turns):.3f} exceeds {args.max_error_rate}")
+            exit_code = 1
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        if fake_runner is not None:
+            await fake_runner.cleanup()
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the v1 server")
+    parser.add_argument("--sessions", type=int, default=20, help="number of WebSocket sessions")
+    parser.add_argument("--mode", choices=["chat", "realtime", "both"], default="both")
+    parser.add_argument("--turns", type=int, default=6, help="max answers replayed per session")
+    parser.add_argument("--think", type=float, default=0.5, help="seconds between turns")
+    parser.add_argument("--ramp", type=float, default=2.0, help="spread session starts over N seconds")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for any frame")
+    parser.add_argument("--script", help="JSON file with [{setup, answers}] scripts")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="pid to sample memory from when using --url")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if turn p95 exceeds this")
+    parser.add_argument("--max-error-rate", type=float, help="fail if errors/turns exceeds this")
+    add_fake_azure_arguments(parser)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,157 @@
+"""
+Event-loop lag watchdog: lag histogram plus stack capture of blocking code
+
+A ticker task measures how late its timer fires. A daemon thread watches the
+ticker's heartbeat and, when the loop stalls past the threshold, logs the
+loop thread's stack with the session id of the running task. Sessions are
+tagged with set_session_id(); tasks they create inherit the id.
+"""
+
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from loguru import logger
+
+# Upper bounds (ms) of the lag histogram buckets; the last bucket is +Inf
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_session_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "session_id", default=None
+)
+_task_sessions: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+
+
+def set_session_id(session_id: str):
+    """Tag the current task, and any task it creates from now on, with a session id."""
+    _session_id.set(session_id)
+    task = asyncio.current_task()
+    if task is not None:
+        _task_sessions[task] = session_id
+
+
+class LoopWatchdog:
+    def __init__(self):
+        self.enabled = os.getenv("LOOP_WATCHDOG", "true").lower() == "true"
+        self.interval_secs = float(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", 100)) / 1000
+        self.stall_ms = float(os.getenv("LOOP_WATCHDOG_STALL_MS", 250))
+
+        self.bucket_counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.lag_sum_ms = 0.0
+        self.lag_count = 0
+        self.max_lag_ms = 0.0
+        self.stalls = 0
+        self.recent_stalls: Deque[Dict] = deque(maxlen=20)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._reported_heartbeat: Optional[float] = None
+        self._stop = threading.Event()
+
+    def observe(self, lag_ms: float):
+        for i, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+        self.lag_sum_ms += lag_ms
+        self.lag_count += 1
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    async def run(self):
+        """Ticker task; also starts the stall-detector thread. Cancel to stop."""
+        if not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._install_task_factory()
+        self._stop.clear()
+        threading.Thread(target=self._detect_stalls, name="loop-watchdog", daemon=True).start()
+        logger.info(f"🐕 Event-loop watchdog on (stall threshold {self.stall_ms:.0f}ms)")
+
+        try:
+            while True:
+                self._heartbeat = time.monotonic()
+                await asyncio.sleep(self.interval_secs)
+                lag_ms = max(0.0, (time.monotonic() - self._heartbeat - self.interval_secs) * 1000)
+                self.observe(lag_ms)
+        finally:
+            self._stop.set()
+
+    def _install_task_factory(self):
+        previous = self._loop.get_task_factory()
+
+        def factory(loop, coro, **kwargs):
+            if previous is not None:
+                task = previous(loop, coro, **kwargs)
+            else:
+                task = asyncio.Task(coro, loop=loop, **kwargs)
+            session_id = _session_id.get()
+            if session_id is not None:
+                _task_sessions[task] = session_id
+            return task
+
+        self._loop.set_task_factory(factory)
+
+    def _detect_stalls(self):
+        threshold_secs = self.interval_secs + self.stall_ms / 1000
+        while not self._stop.wait(self.interval_secs / 2):
+            heartbeat = self._heartbeat
+            blocked_secs = time.monotonic() - heartbeat
+            if blocked_secs < threshold_secs or self._reported_heartbeat == heartbeat:
+                continue
+            # Report each stall once, while it is still happening
+            self._reported_heartbeat = heartbeat
+            self._report_stall((blocked_secs - self.interval_secs) * 1000)
+
+    def _report_stall(self, lag_ms: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        task = asyncio.current_task(self._loop)
+        session_id = _task_sessions.get(task) if task is not None else None
+
+        self.stalls += 1
+        self.recent_stalls.append(
+            {
+                "at": time.time(),
+                "lag_ms": round(lag_ms, 1),
+                "session_id": session_id,
+                "task": task.get_name() if task is not None else None,
+                "stack": stack,
+            }
+        )
+        logger.warning(
+            f"🐢 Event loop blocked for {lag_ms:.0f}ms+ "
+            f"(session {session_id or '-'}, task {task.get_name() if task else '-'}):\n{stack}"
+        )
+
+    def snapshot(self) -> Dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(list(LAG_BUCKETS_MS) + ["+Inf"], self.bucket_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "enabled": self.enabled,
+            "interval_ms": self.interval_secs * 1000,
+            "stall_threshold_ms": self.stall_ms,
+            "samples": self.lag_count,
+            "mean_lag_ms": round(self.lag_sum_ms / self.lag_count, 2) if self.lag_count else None,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "histogram_ms": buckets,  # Cumulative counts, lag <= bucket bound
+            "stalls": self.stalls,
+            "recent_stalls": list(self.recent_stalls),
+        }
+
+
+# Process-wide watchdog
+loop_watchdog = LoopWatchdog()
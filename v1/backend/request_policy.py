@@ -0,0 +1,181 @@
+"""
+Retry, hedging and latency statistics for Azure OpenAI requests
+"""
+import asyncio
+import os
+import random
+import time
+from collections import defaultdict, deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+import aiohttp
+from loguru import logger
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Seconds to wait from retry-after-ms / Retry-After headers, if present"""
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("Retry-After")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyStats:
+    """Rolling latency samples and counters, kept per deployment"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"requests": 0, "errors": 0, "retries": 0, "hedges": 0, "hedge_wins": 0}
+        )
+
+    def record(self, key: str, latency: float):
+        self._samples[key].append(latency)
+
+    def count(self, key: str, counter: str):
+        self._counters[key][counter] += 1
+
+    def samples(self, key: str) -> int:
+        return len(self._samples[key])
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        samples = sorted(self._samples[key])
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(q / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        keys = set(self._samples) | set(self._counters)
+        return {
+            key: {
+                "samples": self.samples(key),
+                "p50_ms": self._ms(self.percentile(key, 50)),
+                "p95_ms": self._ms(self.percentile(key, 95)),
+                "p99_ms": self._ms(self.percentile(key, 99)),
+                **self._counters[key],
+            }
+            for key in sorted(keys)
+        }
+
+    @staticmethod
+    def _ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+
+
+class RequestPolicy:
+    """
+    Runs a request with jittered-backoff retries and optional hedging.
+
+    Retries happen on 429/5xx (honouring Retry-After) and connection errors.
+    With hedging on, a second identical request is fired once the first has
+    been outstanding longer than the observed latency percentile for that
+    key; whichever succeeds first wins and the other is cancelled.
+    """
+
+    def __init__(self):
+        self.max_retries = int(os.getenv("AZURE_OPENAI_MAX_RETRIES", 3))
+        self.backoff_base = float(os.getenv("AZURE_OPENAI_BACKOFF_BASE", 0.5))
+        self.backoff_max = float(os.getenv("AZURE_OPENAI_BACKOFF_MAX", 8))
+        self.max_retry_after = float(os.getenv("AZURE_OPENAI_MAX_RETRY_AFTER", 30))
+        self.hedging = os.getenv("AZURE_OPENAI_HEDGING", "false").lower() == "true"
+        self.hedge_percentile = float(os.getenv("AZURE_OPENAI_HEDGE_PERCENTILE", 95))
+        self.hedge_min_samples = int(os.getenv("AZURE_OPENAI_HEDGE_MIN_SAMPLES", 20))
+        self.stats = LatencyStats()
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps concurrent sessions from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def run(
+        self,
+        key: str,
+        request: Callable[[], Awaitable[T]],
+        discard: Optional[Callable[[T], None]] = None,
+    ) -> T:
+        """Run `request` under the policy; `discard` releases a losing hedge's result"""
+        for attempt in range(self.max_retries + 1):
+            self.stats.count(key, "requests")
+            try:
+                return await self._hedged(key, request, discard)
+            except Exception as e:
+                self.stats.count(key, "errors")
+                status = getattr(e, "status", None)
+                connection_error = isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+                if not (status in RETRYABLE_STATUSES or connection_error) or attempt == self.max_retries:
+                    raise
+
+                delay = self._backoff(attempt)
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after is not None:
+                    delay = min(retry_after, self.max_retry_after)
+                logger.warning(f"⚠️ Azure request failed ({status or type(e).__name__}), retrying in {delay:.2f}s")
+
+            self.stats.count(key, "retries")
+            await asyncio.sleep(delay)
+
+    async def _hedged(self, key, request, discard):
+        start = time.monotonic()
+        hedge_after = None
+        if self.hedging and self.stats.samples(key) >= self.hedge_min_samples:
+            hedge_after = self.stats.percentile(key, self.hedge_percentile)
+
+        if hedge_after is None:
+            result = await request()
+            self.stats.record(key, time.monotonic() - start)
+            return result
+
+        primary = asyncio.create_task(request())
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if done:
+                result = primary.result()
+                self.stats.record(key, time.monotonic() - start)
+                return result
+
+            logger.info(f"🪁 Hedging Azure request after {hedge_after * 1000:.0f}ms")
+            self.stats.count(key, "hedges")
+            hedge = asyncio.create_task(request())
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is hedge:
+                        self.stats.count(key, "hedge_wins")
+                    self.stats.record(key, time.monotonic() - start)
+                    # Release any other request that also completed
+                    for other in done - {task}:
+                        if discard is not None and other.exception() is None:
+                            discard(other.result())
+                    return task.result()
+            raise error
+        finally:
+            # Cancel the losing (or abandoned) request
+            for task in pending:
+                task.cancel()
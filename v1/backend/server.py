@@ -2,7 +2,9 @@
 FastAPI server for real-time AI interview chatbot using Pipecat
 """
 import os
+import uuid
 import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -15,8 +17,24 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from llm_client import init_llm_client, close_llm_client, get_llm_client
+from loop_watchdog import loop_watchdog, set_session_id
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared Azure OpenAI connection pool and start the loop watchdog"""
+    await init_llm_client()
+    watchdog_task = asyncio.create_task(loop_watchdog.run())
+    try:
+        yield
+    finally:
+        watchdog_task.cancel()
+        await close_llm_client()
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Interview AI API")
+app = FastAPI(title="Interview AI API", lifespan=lifespan)
 
 # Configure CORS for web frontend
 app.add_middleware(
@@ -37,12 +55,25 @@ async def root():
     return {"status": "ok", "message": "Interview AI API is running"}
 
 
+@app.get("/api/llm-stats")
+async def llm_stats():
+    """Azure OpenAI latency percentiles and retry / hedge counters per deployment"""
+    return get_llm_client().policy.stats.snapshot()
+
+
+@app.get("/api/loop-stats")
+async def loop_stats():
+    """Event-loop lag histogram and recent stalls with the blocking stacks"""
+    return loop_watchdog.snapshot()
+
+
 @app.websocket("/ws/interview")
 async def websocket_interview(websocket: WebSocket):
     """
     WebSocket endpoint for real-time interview session (original version)
     """
     await websocket.accept()
+    set_session_id(f"chat-{uuid.uuid4().hex[:8]}")
     logger.info("Client connected to interview session")
     
     try:
@@ -67,6 +98,7 @@ async def websocket_interview_realtime(websocket: WebSocket):
     No chat interface, just conversation with final feedback
     """
     await websocket.accept()
+    set_session_id(f"interview-{uuid.uuid4().hex[:8]}")
     logger.info("Client connected to real-time interview session")
     
     try:
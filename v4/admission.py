@@ -0,0 +1,172 @@
+"""
+Admission control for new interview sessions.
+
+Every session runs VAD, smart-turn inference and video handling in this
+process, so once the pod is saturated each extra session slows down all the
+others. The controller caps concurrent sessions and stops admitting while the
+event loop is lagging or the CPU is pegged; offers over the limit wait in a
+short FIFO queue, or are refused with an estimated wait when the queue is full
+or the wait runs out.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from loguru import logger
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class LoadMonitor:
+    """Samples event-loop lag and process CPU usage in the background."""
+
+    def __init__(self, interval_secs: float = 0.5, smoothing: float = 0.3):
+        self.interval_secs = interval_secs
+        self.smoothing = smoothing
+        self.loop_lag_ms = 0.0  # Smoothed lag of a timer scheduled `interval_secs` ahead
+        self.cpu_percent = 0.0  # Smoothed process CPU time / wall time, across all cores
+        self._cpu_count = os.cpu_count() or 1
+
+    def _smooth(self, current: float, sample: float) -> float:
+        return current + self.smoothing * (sample - current)
+
+    async def run(self):
+        last_wall = time.monotonic()
+        last_cpu = time.process_time()
+        while True:
+            await asyncio.sleep(self.interval_secs)
+            now = time.monotonic()
+            cpu = time.process_time()
+
+            lag_ms = max(0.0, (now - last_wall - self.interval_secs) * 1000)
+            cpu_percent = (cpu - last_cpu) / max(now - last_wall, 1e-6) / self._cpu_count * 100
+            self.loop_lag_ms = self._smooth(self.loop_lag_ms, lag_ms)
+            self.cpu_percent = self._smooth(self.cpu_percent, cpu_percent)
+
+            last_wall, last_cpu = now, cpu
+
+
+class AdmissionController:
+    """Caps concurrent sessions and queues or refuses offers when overloaded."""
+
+    def __init__(self, monitor: LoadMonitor):
+        self.monitor = monitor
+        self.max_sessions = int(os.getenv("MAX_SESSIONS", 4))
+        self.max_loop_lag_ms = float(os.getenv("ADMISSION_MAX_LOOP_LAG_MS", 150))
+        self.max_cpu_percent = float(os.getenv("ADMISSION_MAX_CPU_PERCENT", 85))
+        self.queue_size = int(os.getenv("ADMISSION_QUEUE_SIZE", 8))
+        self.queue_timeout_secs = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECS", 20))
+        # Typical interview length, used for wait estimates until we have real samples
+        self.default_session_secs = float(os.getenv("ADMISSION_DEFAULT_SESSION_SECS", 600))
+
+        self.active = 0
+        self._waiters: Deque[object] = deque()
+        self._changed = asyncio.Event()
+        self._durations: Deque[float] = deque(maxlen=50)
+        self._counters = {"admitted_total": 0, "queued_total": 0, "rejected_total": 0}
+
+    def overloaded(self) -> Optional[str]:
+        """Why a new session cannot start right now, or None if it can."""
+        if self.active >= self.max_sessions:
+            return "session limit reached"
+        # Always let one session run, however busy the host looks
+        if self.active == 0:
+            return None
+        if self.max_loop_lag_ms > 0 and self.monitor.loop_lag_ms > self.max_loop_lag_ms:
+            return "event loop lagging"
+        if self.max_cpu_percent > 0 and self.monitor.cpu_percent > self.max_cpu_percent:
+            return "CPU saturated"
+        return None
+
+    def estimated_wait_secs(self, position: int) -> float:
+        """Rough wait for the `position`-th queued offer (1-based)."""
+        session_secs = (
+            sum(self._durations) / len(self._durations)
+            if self._durations
+            else self.default_session_secs
+        )
+        # Sessions end at a roughly even rate over an average session length
+        per_slot = session_secs / max(1, self.max_sessions)
+        return round(per_slot * position, 1)
+
+    async def acquire(self):
+        """Take a session slot, waiting in the queue if needed; raises AdmissionRejected."""
+        if not self._waiters and self.overloaded() is None:
+            self._admit()
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self._counters["rejected_total"] += 1
+            reason = self.overloaded() or "admission queue full"
+            raise AdmissionRejected(reason, self.estimated_wait_secs(len(self._waiters) + 1))
+
+        waiter = object()
+        self._waiters.append(waiter)
+        self._counters["queued_total"] += 1
+        logger.info(f"⏳ Offer queued at position {len(self._waiters)}: {self.overloaded()}")
+        deadline = time.monotonic() + self.queue_timeout_secs
+        try:
+            while True:
+                if self._waiters[0] is waiter and self.overloaded() is None:
+                    self._admit()
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["rejected_total"] += 1
+                    position = self._waiters.index(waiter) + 1
+                    raise AdmissionRejected(
+                        self.overloaded() or "timed out in admission queue",
+                        self.estimated_wait_secs(position),
+                    )
+                self._changed.clear()
+                # Wake on releases, and re-check lag/CPU at the monitor's pace
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait(), min(remaining, self.monitor.interval_secs)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._waiters.remove(waiter)
+            self._changed.set()
+
+    def _admit(self):
+        self.active += 1
+        self._counters["admitted_total"] += 1
+
+    def release(self, duration_secs: Optional[float] = None):
+        """Give back a slot when a session ends (or its setup failed)."""
+        self.active = max(0, self.active - 1)
+        if duration_secs is not None:
+            self._durations.append(duration_secs)
+        self._changed.set()
+
+    def snapshot(self) -> Dict:
+        return {
+            "active": self.active,
+            "max_sessions": self.max_sessions,
+            "queued": len(self._waiters),
+            "overloaded": self.overloaded(),
+            "loop_lag_ms": round(self.monitor.loop_lag_ms, 1),
+            "cpu_percent": round(self.monitor.cpu_percent, 1),
+            "estimated_wait_secs": self.estimated_wait_secs(len(self._waiters) + 1),
+            **self._counters,
+        }
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+# Process-wide controller
+load_monitor = LoadMonitor()
+admission = AdmissionController(load_monitor)
@@ -0,0 +1,336 @@
+"""
+Interview bot pipeline - the pipecat side of the server.
+
+Importing this module pulls in the whole pipecat stack (VAD, smart-turn, STT,
+LLM, TTS and Simli services), so server.py imports it lazily in a background
+warm-up task instead of at startup.
+"""
+
+import os
+from collections import deque
+from typing import Optional
+
+from loguru import logger
+from pipecat.audio.vad.vad_analyzer import VADParams
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    CancelFrame,
+    EndFrame,
+    InterimTranscriptionFrame,
+    InterruptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMRunFrame,
+    LLMTextFrame,
+    MetricsFrame,
+    OutputImageRawFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    UserStoppedSpeakingFrame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.metrics.metrics import (
+    LLMUsageMetricsData,
+    ProcessingMetricsData,
+    SmartTurnMetricsData,
+    TTFBMetricsData,
+    TTSUsageMetricsData,
+)
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.aggregators.llm_response_universal import LLMContextAggregatorPair
+from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.processors.frameworks.rtvi import (
+    RTVIConfig,
+    RTVIObserver,
+    RTVIObserverParams,
+    RTVIProcessor,
+)
+from pipecat.services.simli.video import SimliVideoService
+from pipecat.services.tts_service import TTSService
+from pipecat.transports.base_transport import TransportParams
+from pipecat.transports.smallwebrtc.connection import SmallWebRTCConnection
+from pipecat.transports.smallwebrtc.transport import SmallWebRTCTransport
+
+from greetings import greeting_prefetcher, interview_messages
+from metrics import pipeline_metrics
+from model_registry import model_registry
+from service_pool import (
+    WarmCartesiaTTSService,
+    WarmDeepgramSTTService,
+    service_pool,
+)
+from speculative_llm import SpeculationTrigger, SpeculativeAzureLLMService, speculation_stats
+from transcripts import SentenceSegmenter, TranscriptSender
+from tts_cache import tts_cache
+from turn_timeline import TurnTimeline
+from video_quality import AdaptiveSimliVideoService, video_governor
+
+# How often queued transcript messages are sent over the data channel
+TRANSCRIPT_FLUSH_SECS = float(os.getenv("TRANSCRIPT_FLUSH_MS", 150)) / 1000
+
+
+class TranscriptProcessor(FrameProcessor):
+    """Streams the bot's reply to the client as whole sentences (sits after the LLM)."""
+
+    def __init__(self, sender: TranscriptSender):
+        super().__init__()
+        self._sender = sender
+        self._segmenter = SentenceSegmenter()
+
+    async def process_frame(self, frame, direction):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMTextFrame) and frame.text:
+            for sentence in self._segmenter.push(frame.text):
+                self._sender.add_bot_sentence(sentence)
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            remainder = self._segmenter.flush()
+            if remainder:
+                self._sender.add_bot_sentence(remainder)
+        elif isinstance(frame, InterruptionFrame):
+            self._segmenter.clear()
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            self._sender.close()
+
+        await self.push_frame(frame, direction)
+
+
+class UserTranscriptProcessor(FrameProcessor):
+    """Streams the candidate's STT transcripts to the client as live captions (after STT)."""
+
+    def __init__(self, sender: TranscriptSender):
+        super().__init__()
+        self._sender = sender
+
+    async def process_frame(self, frame, direction):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, TranscriptionFrame) and frame.text:
+            self._sender.add_user_transcript(frame.text, final=True)
+        elif isinstance(frame, InterimTranscriptionFrame) and frame.text:
+            self._sender.add_user_transcript(frame.text, final=False)
+
+        await self.push_frame(frame, direction)
+
+
+class MetricsObserver(BaseObserver):
+    """Feeds the pipeline's TTFB, processing-time and usage metrics into /metrics."""
+
+    def __init__(self):
+        super().__init__()
+        # A metrics frame is seen once per hop; count it only the first time
+        self._seen = deque(maxlen=256)
+
+    async def on_push_frame(self, data: FramePushed):
+        frame = data.frame
+        if not isinstance(frame, MetricsFrame) or frame.id in self._seen:
+            return
+        self._seen.append(frame.id)
+        for metrics_data in frame.data:
+            if isinstance(metrics_data, TTFBMetricsData):
+                pipeline_metrics.record_ttfb(metrics_data)
+            elif isinstance(metrics_data, ProcessingMetricsData):
+                pipeline_metrics.record_processing(metrics_data)
+            elif isinstance(metrics_data, LLMUsageMetricsData):
+                pipeline_metrics.record_llm_usage(metrics_data)
+            elif isinstance(metrics_data, TTSUsageMetricsData):
+                pipeline_metrics.record_tts_usage(metrics_data)
+            elif isinstance(metrics_data, SmartTurnMetricsData):
+                pipeline_metrics.record_smart_turn(metrics_data)
+
+
+class TurnTracingObserver(BaseObserver):
+    """Timestamps each stage of a turn for the session timeline (see turn_timeline.py)."""
+
+    def __init__(self, timeline: TurnTimeline):
+        super().__init__()
+        self._timeline = timeline
+        # Frames are seen once per hop; remember the last one of each type handled
+        self._last_ids: dict = {}
+        self._speech_started_ns = 0
+        self._last_final_ns: Optional[int] = None
+
+    def _first_sighting(self, frame) -> bool:
+        if self._last_ids.get(type(frame)) == frame.id:
+            return False
+        self._last_ids[type(frame)] = frame.id
+        return True
+
+    async def on_push_frame(self, data: FramePushed):
+        frame, timestamp, timeline = data.frame, data.timestamp, self._timeline
+
+        if isinstance(frame, TTSAudioRawFrame):
+            if isinstance(data.source, SimliVideoService):
+                if timeline.marked("tts_first_audio"):
+                    timeline.mark("avatar_first_audio", timestamp)
+            elif isinstance(data.source, TTSService):
+                timeline.mark("tts_first_audio", timestamp)
+        elif isinstance(frame, OutputImageRawFrame):
+            if timeline.marked("avatar_first_audio") and isinstance(data.source, SimliVideoService):
+                timeline.mark("avatar_first_video", timestamp)
+        elif isinstance(frame, LLMTextFrame):
+            timeline.mark("llm_first_token", timestamp)
+        elif not self._first_sighting(frame):
+            return
+        elif isinstance(frame, VADUserStartedSpeakingFrame):
+            # The candidate kept talking (or interrupted): this turn gets no reply of its own
+            self._speech_started_ns = timestamp
+            timeline.cancel()
+        elif isinstance(frame, VADUserStoppedSpeakingFrame):
+            timeline.start(timestamp)
+            if self._last_final_ns is not None and self._last_final_ns >= self._speech_started_ns:
+                timeline.mark("stt_final", self._last_final_ns)
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            timeline.mark("turn_end", timestamp)
+        elif isinstance(frame, TranscriptionFrame):
+            self._last_final_ns = timestamp
+            if not timeline.marked("llm_first_token"):
+                timeline.mark("stt_final", timestamp, overwrite=True)
+        elif isinstance(frame, BotStartedSpeakingFrame):
+            if timeline.marked("llm_first_token"):
+                timeline.finish(timestamp)
+
+
+async def run_bot(
+    connection: SmallWebRTCConnection,
+    setup_data: dict = None,
+    timeline: Optional[TurnTimeline] = None,
+):
+    """Run the interview bot for a connection."""
+    try:
+        logger.info(f"Starting bot with setup: {setup_data}")
+
+        # Initialize services; each takes a pre-opened upstream connection from the pool
+        # when one is available
+        stt = WarmDeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
+        # Repeated phrases (greetings, acknowledgements) are replayed from the on-disk cache
+        tts = WarmCartesiaTTSService(
+            cache=tts_cache,
+            api_key=os.getenv("CARTESIA_API_KEY"),
+            voice_id="79a125e8-cd45-4c13-8a67-188112f4dd22",  # British Lady
+        )
+        # Opt-in (SPECULATIVE_LLM): replies can start on the interim transcript
+        llm = SpeculativeAzureLLMService(
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+        )
+
+        # Video profile for this session from the host load; audio-only when overloaded.
+        # The client hears about frame-rate changes, and audio-only once the avatar stops
+        video = video_governor.session(
+            connection,
+            on_change=lambda profile: connection.send_app_message(
+                {"type": "video-mode", "mode": profile.name}
+            ),
+        )
+
+        # Simli AI Avatar - processes TTS audio and generates video
+        simli_ai = None
+        if not video.audio_only:
+            simli_ai = AdaptiveSimliVideoService(
+                adapter=video,
+                api_key=os.getenv("SIMLI_API_KEY"),
+                face_id=os.getenv("SIMLI_FACE_ID"),
+            )
+
+        messages = interview_messages(setup_data)
+
+        context = LLMContext(messages)
+        context_aggregator = LLMContextAggregatorPair(context)
+        rtvi = RTVIProcessor(config=RTVIConfig(config=[]))
+
+        # Create transport with video output enabled for Simli avatar
+        transport = SmallWebRTCTransport(
+            webrtc_connection=connection,
+            params=TransportParams(
+                audio_in_enabled=True,
+                audio_out_enabled=True,
+                video_out_enabled=simli_ai is not None,
+                video_out_is_live=True,
+                video_out_width=video.resolution.width,
+                video_out_height=video.resolution.height,
+                video_out_framerate=video.resolution.fps,
+                # Per-session analyzer state backed by the shared, preloaded models
+                vad_analyzer=model_registry.vad_analyzer(VADParams(stop_secs=0.5)),
+                turn_analyzer=model_registry.turn_analyzer(),
+            ),
+        )
+
+        # Transcript processors share one sender, so captions go out in coalesced batches
+        transcript_sender = TranscriptSender(connection.send_app_message, TRANSCRIPT_FLUSH_SECS)
+        user_transcripts = UserTranscriptProcessor(transcript_sender)
+        transcript_processor = TranscriptProcessor(transcript_sender)
+
+        pipeline = Pipeline(
+            [
+                transport.input(),
+                rtvi,
+                stt,
+                user_transcripts,
+                *([SpeculationTrigger(llm, context)] if speculation_stats.enabled else []),
+                context_aggregator.user(),
+                llm,
+                transcript_processor,
+                tts,
+                # Simli processes TTS audio and outputs video frames; audio-only skips it
+                *([simli_ai] if simli_ai else []),
+                transport.output(),
+                context_aggregator.assistant(),
+            ]
+        )
+
+        task = PipelineTask(
+            pipeline,
+            params=PipelineParams(enable_metrics=True, enable_usage_metrics=True),
+            observers=[
+                RTVIObserver(
+                    rtvi,
+                    # Per-token LLM text and user transcripts are replaced by the coalesced
+                    # transcript messages; the frontend only uses bot-tts-text from RTVI
+                    params=RTVIObserverParams(
+                        bot_llm_enabled=False,
+                        bot_output_enabled=False,
+                        user_llm_enabled=False,
+                        user_transcription_enabled=False,
+                    ),
+                ),
+                MetricsObserver(),
+                TurnTracingObserver(timeline or TurnTimeline()),
+            ],
+        )
+
+        @transport.event_handler("on_client_connected")
+        async def on_client_connected(transport, client):
+            greeting = await greeting_prefetcher.take(setup_data)
+            if greeting:
+                # Speak the greeting prepared during negotiation as if the LLM had just
+                # streamed it; the assistant aggregator adds it to the context
+                logger.info("Client connected - Starting interview with the prepared greeting")
+                for frame in (
+                    LLMFullResponseStartFrame(),
+                    LLMTextFrame(greeting),
+                    LLMFullResponseEndFrame(),
+                ):
+                    await llm.queue_frame(frame)
+            else:
+                logger.info("Client connected - Starting interview")
+                await task.queue_frames([LLMRunFrame()])
+
+        @transport.event_handler("on_client_disconnected")
+        async def on_client_disconnected(transport, client):
+            logger.info("Client disconnected")
+            await task.cancel()
+
+        runner = PipelineRunner(handle_sigint=False)
+        await runner.run(task)
+
+    except Exception as e:
+        logger.error(f"❌ Bot execution failed: {str(e)}", exc_info=True)
+        # Don't crash the server, just log the error
@@ -0,0 +1,161 @@
+"""
+Interview prompt and speculative greeting generation.
+
+The bot's first turn only depends on the interview setup, which the frontend
+posts before its offer. Instead of starting the LLM call when the client has
+connected (after SDP and ICE), `GreetingPrefetcher` starts it when the setup
+or offer arrives, so the greeting is usually ready by the time the client is.
+Greetings are keyed on a fingerprint of the setup: a changed setup never gets
+a stale greeting, and unclaimed ones are cancelled after a TTL.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from service_pool import service_pool
+
+SYSTEM_PROMPT = """You are a professional AI interview coach conducting a realistic job interview practice session.
+
+Your role is to:
+- Ask relevant behavioral and technical interview questions
+- Listen actively to the candidate's responses
+- Ask thoughtful follow-up questions when appropriate
+- Maintain a professional but friendly demeanor
+- Help candidates improve their interview skills through practice
+- Keep responses concise and natural, as in a real interview
+
+Interview Guidelines:
+1. Tailor questions to the candidate's target role and experience level
+2. Ask about past projects, challenges, and achievements
+3. Probe for specific examples and details
+4. Ask 5-7 questions total, then conclude the interview
+5. End by thanking them and wishing them luck
+
+Keep your tone professional yet encouraging. Ask one question at a time and wait for responses."""
+
+
+def interview_messages(setup_data: Optional[Dict]) -> List[Dict]:
+    """The initial LLM messages for an interview with this setup."""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+
+    # Add context based on setup
+    if setup_data:
+        context_msg = f"""The candidate has provided the following information:
+- Target Position: {setup_data.get("jobTitle", "Not specified")}
+- Company: {setup_data.get("company", "Not specified")}
+- Interview Format: {setup_data.get("interviewFormat", "Not specified")}
+- Experience: {setup_data.get("experience", "Not specified")}
+
+Greet the candidate warmly by acknowledging you know they're preparing for the {setup_data.get("jobTitle", "position")} role at {setup_data.get("company", "their target company")}. Start with your first interview question directly - do NOT ask them what role they're preparing for since you already know."""
+        messages.append({"role": "system", "content": context_msg})
+    else:
+        messages.append(
+            {
+                "role": "system",
+                "content": "Greet the candidate warmly and ask what job role they are preparing to interview for. Keep it brief and professional.",
+            }
+        )
+    return messages
+
+
+class GreetingPrefetcher:
+    """Generates greetings ahead of the connection, one in-flight task per setup."""
+
+    def __init__(self):
+        self.enabled = os.getenv("GREETING_PREFETCH", "true").lower() == "true"
+        # How long a connected client waits for an in-flight greeting before the normal path
+        self.wait_secs = float(os.getenv("GREETING_PREFETCH_WAIT_SECS", 3))
+        self.ttl_secs = float(os.getenv("GREETING_PREFETCH_TTL_SECS", 300))
+        self.max_entries = int(os.getenv("GREETING_PREFETCH_MAX", 100))
+        self._pending: "OrderedDict[str, Tuple[float, asyncio.Task]]" = OrderedDict()
+        self.stats = {"started": 0, "used": 0, "missed": 0, "discarded": 0, "failed": 0}
+        self.last_generation_ms: Optional[float] = None
+
+    @staticmethod
+    def fingerprint(setup_data: Optional[Dict]) -> str:
+        material = json.dumps(setup_data or {}, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def prefetch(self, setup_data: Optional[Dict]):
+        """Start generating the greeting for this setup, unless already under way."""
+        if not self.enabled:
+            return
+        self._prune()
+        key = self.fingerprint(setup_data)
+        if key in self._pending:
+            return
+        task = asyncio.create_task(self._generate(setup_data))
+        self._pending[key] = (time.monotonic(), task)
+        self.stats["started"] += 1
+
+        while len(self._pending) > self.max_entries:
+            self._discard(next(iter(self._pending)))
+
+    async def _generate(self, setup_data: Optional[Dict]) -> Optional[str]:
+        start = time.perf_counter()
+        response = await service_pool.llm_client().chat.completions.create(
+            model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+            messages=interview_messages(setup_data),
+        )
+        self.last_generation_ms = round((time.perf_counter() - start) * 1000)
+        greeting = (response.choices[0].message.content or "").strip()
+        logger.info(f"👋 Greeting prepared in {self.last_generation_ms}ms")
+        return greeting or None
+
+    async def take(self, setup_data: Optional[Dict]) -> Optional[str]:
+        """Claim the prepared greeting for this setup, or None to generate it in the pipeline."""
+        entry = self._pending.pop(self.fingerprint(setup_data), None)
+        if entry is None:
+            self.stats["missed"] += 1
+            return None
+        _, task = entry
+        try:
+            greeting = await asyncio.wait_for(task, timeout=self.wait_secs)
+        except asyncio.TimeoutError:
+            logger.warning("Prepared greeting not ready in time, generating it in the pipeline")
+            self.stats["missed"] += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Greeting prefetch failed: {e}")
+            self.stats["failed"] += 1
+            return None
+        if greeting is None:
+            self.stats["missed"] += 1
+            return None
+        self.stats["used"] += 1
+        return greeting
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [
+            key for key, (created, _) in self._pending.items() if now - created > self.ttl_secs
+        ]
+        for key in expired:
+            self._discard(key)
+
+    def _discard(self, key: str):
+        _, task = self._pending.pop(key)
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is not None:
+            self.stats["failed"] += 1  # Retrieve the exception so it is not logged as unhandled
+        self.stats["discarded"] += 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "last_generation_ms": self.last_generation_ms,
+            **self.stats,
+        }
+
+
+# Process-wide prefetcher
+greeting_prefetcher = GreetingPrefetcher()
@@ -0,0 +1,187 @@
+"""
+Bounded executor pools for VAD and smart-turn inference, shared by all sessions.
+
+Pipecat gives every analyzer its own single-thread executor, so each session
+adds threads competing for the same cores, and a slow smart-turn call has
+nothing to stop it piling up behind the others. Here all sessions share two
+small pools: VAD frames (short, latency sensitive) and smart-turn predictions
+(long) never queue behind each other. Smart-turn requests that arrive within
+a short window are run as one batched ONNX call. The pipeline only awaits
+results. Queue wait and inference time are recorded per call.
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import onnxruntime as ort
+from loguru import logger
+from transformers import WhisperFeatureExtractor
+
+SMART_TURN_SECONDS = 8
+SAMPLE_RATE = 16000
+
+
+class InferenceStats:
+    """Rolling queue-wait / inference timings and batch sizes per model."""
+
+    def __init__(self, window: int = 500):
+        self._queue_wait_ms: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._inference_ms: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._batch_sizes: Dict[str, Deque[int]] = defaultdict(lambda: deque(maxlen=window))
+        self._calls: Dict[str, int] = defaultdict(int)
+
+    def record(self, model: str, queue_wait_ms: float, inference_ms: float, batch_size: int = 1):
+        self._queue_wait_ms[model].append(queue_wait_ms)
+        self._inference_ms[model].append(inference_ms)
+        self._batch_sizes[model].append(batch_size)
+        self._calls[model] += 1
+
+    @staticmethod
+    def _percentile(samples, q: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))], 2)
+
+    def snapshot(self) -> Dict:
+        return {
+            model: {
+                "calls": self._calls[model],
+                "queue_wait_p50_ms": self._percentile(self._queue_wait_ms[model], 50),
+                "queue_wait_p95_ms": self._percentile(self._queue_wait_ms[model], 95),
+                "inference_p50_ms": self._percentile(self._inference_ms[model], 50),
+                "inference_p95_ms": self._percentile(self._inference_ms[model], 95),
+                "mean_batch_size": (
+                    round(sum(self._batch_sizes[model]) / len(self._batch_sizes[model]), 2)
+                    if self._batch_sizes[model]
+                    else None
+                ),
+            }
+            for model in sorted(self._calls)
+        }
+
+
+class SmartTurnBatcher:
+    """Coalesces smart-turn predictions from all sessions into batched ONNX calls."""
+
+    def __init__(
+        self,
+        session: ort.InferenceSession,
+        feature_extractor: WhisperFeatureExtractor,
+        executor: ThreadPoolExecutor,
+        stats: InferenceStats,
+    ):
+        self._session = session
+        self._feature_extractor = feature_extractor
+        self._executor = executor
+        self._stats = stats
+        self.max_batch = int(os.getenv("SMART_TURN_MAX_BATCH", 8))
+        self.batch_window_secs = float(os.getenv("SMART_TURN_BATCH_WINDOW_MS", 5)) / 1000
+        self._pending: List[Tuple[float, np.ndarray, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def predict(self, audio: np.ndarray) -> Dict:
+        """End-of-turn prediction for one session's speech segment."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((time.perf_counter(), audio, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window_secs, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending[: self.max_batch], self._pending[self.max_batch :]
+        if self._pending:
+            # More than one batch waiting; schedule the rest right away
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush)
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            started, results = await loop.run_in_executor(
+                self._executor, self._infer, [audio for _, audio, _ in batch]
+            )
+        except Exception as e:
+            logger.error(f"❌ Smart-turn batch of {len(batch)} failed: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        finished = time.perf_counter()
+        inference_ms = (finished - started) * 1000
+        for (enqueued, _, future), probability in zip(batch, results):
+            queue_wait_ms = (started - enqueued) * 1000
+            self._stats.record("smart_turn", queue_wait_ms, inference_ms, len(batch))
+            if not future.done():
+                future.set_result(
+                    {
+                        "prediction": 1 if probability > 0.5 else 0,
+                        "probability": probability,
+                        "queue_wait_ms": queue_wait_ms,
+                        "inference_ms": inference_ms,
+                    }
+                )
+
+    def _infer(self, audios: List[np.ndarray]) -> Tuple[float, List[float]]:
+        """Feature extraction + one ONNX call for the whole batch (runs in the pool)."""
+        started = time.perf_counter()
+        max_samples = SMART_TURN_SECONDS * SAMPLE_RATE
+        # Keep the last 8 seconds, left-padding shorter segments with silence
+        padded = [
+            audio[-max_samples:]
+            if len(audio) >= max_samples
+            else np.pad(audio, (max_samples - len(audio), 0))
+            for audio in audios
+        ]
+        inputs = self._feature_extractor(
+            padded,
+            sampling_rate=SAMPLE_RATE,
+            return_tensors="np",
+            padding="max_length",
+            max_length=max_samples,
+            truncation=True,
+            do_normalize=True,
+        )
+        features = inputs.input_features.astype(np.float32)
+        outputs = self._session.run(None, {"input_features": features})
+        return started, [float(p) for p in outputs[0][:, 0]]
+
+
+class InferencePool:
+    """The shared VAD and smart-turn executors plus their timing stats."""
+
+    def __init__(self):
+        self.vad_workers = int(os.getenv("VAD_POOL_SIZE", 2))
+        self.smart_turn_workers = int(os.getenv("SMART_TURN_POOL_SIZE", 1))
+        self.vad_executor = ThreadPoolExecutor(
+            max_workers=self.vad_workers, thread_name_prefix="vad"
+        )
+        self.smart_turn_executor = ThreadPoolExecutor(
+            max_workers=self.smart_turn_workers, thread_name_prefix="smart-turn"
+        )
+        self.stats = InferenceStats()
+
+    def snapshot(self) -> Dict:
+        return {
+            "vad_workers": self.vad_workers,
+            "smart_turn_workers": self.smart_turn_workers,
+            "models": self.stats.snapshot(),
+        }
+
+
+# Process-wide pools
+inference_pool = InferencePool()
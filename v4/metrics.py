@@ -0,0 +1,228 @@
+"""
+Prometheus metrics for the interview pipeline.
+
+Pipecat emits TTFB, processing-time and usage metrics as frames; the
+`MetricsObserver` in bot.py hands them to `pipeline_metrics`, which keeps
+per-service histograms and counters. `render()` writes them, with the session
+and admission gauges passed in by server.py, in the Prometheus text format
+for `GET /metrics`. No client library: these few metric types are simple to
+write out and the module stays importable before pipecat is.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS_SECS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Iterable[float] = LATENCY_BUCKETS_SECS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        self._sums[key] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ["+Inf"], counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_number(self._sums[key])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[Labels, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels: str):
+        self._values[tuple(sorted(labels.items()))] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_number(value)}")
+        return lines
+
+
+def family(name: str, help: str, kind: str, samples: Dict[Labels, Optional[float]]) -> List[str]:
+    """A gauge or counter read at scrape time; samples with a None value are left out."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for key, value in samples.items():
+        if value is not None:
+            lines.append(f"{name}{_format_labels(key)} {_number(value)}")
+    return lines
+
+
+def histogram_from_counts(
+    name: str, help: str, buckets: Iterable[float], counts: List[int], total: float
+) -> List[str]:
+    """A histogram kept elsewhere as per-bucket counts (last one +Inf) and a sum."""
+    histogram = Histogram(name, help, buckets)
+    if sum(counts):
+        histogram._counts[()] = list(counts)
+        histogram._sums[()] = total
+    return histogram.render()
+
+
+def service_of(processor: str) -> str:
+    """Pipeline stage of a processor name, e.g. "WarmDeepgramSTTService#0" -> "stt"."""
+    name = re.sub(r"#\d+$", "", processor)
+    for marker, service in (
+        ("STT", "stt"),
+        ("LLM", "llm"),
+        ("TTS", "tts"),
+        ("Simli", "avatar"),
+        ("SmartTurn", "turn"),
+    ):
+        if marker in name:
+            return service
+    return name.lower()
+
+
+def merge_expositions(texts: Dict[str, str], label: str) -> str:
+    """Merge several processes' /metrics output, telling their samples apart by a label."""
+    headers: Dict[str, List[str]] = {}
+    samples: Dict[str, List[str]] = defaultdict(list)
+    for value, text in texts.items():
+        family_name = None
+        for line in text.splitlines():
+            if line.startswith("# "):
+                parts = line.split(" ", 3)
+                if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                    family_name = parts[2]
+                    headers.setdefault(family_name, [])
+                    if line not in headers[family_name]:
+                        headers[family_name].append(line)
+                continue
+            if not line or family_name is None:
+                continue
+            name, brace, rest = line.partition("{")
+            extra = f'{label}="{_escape(value)}"'
+            if brace:
+                line = (
+                    f"{name}{{{extra},{rest}"
+                    if not rest.startswith("}")
+                    else f"{name}{{{extra}{rest}"
+                )
+            else:
+                metric, _, number = line.partition(" ")
+                line = f"{metric}{{{extra}}} {number}"
+            samples[family_name].append(line)
+    lines = []
+    for family_name, header in headers.items():
+        lines.extend(header)
+        lines.extend(samples[family_name])
+    return "\n".join(lines) + "\n"
+
+
+class PipelineMetrics:
+    """Per-service latency histograms and usage counters from pipecat metrics frames."""
+
+    def __init__(self):
+        self.ttfb = Histogram(
+            "interview_ttfb_seconds", "Time to first byte of each service response."
+        )
+        self.processing = Histogram(
+            "interview_processing_seconds", "Processing time of each service call."
+        )
+        self.smart_turn = Histogram(
+            "interview_smart_turn_inference_seconds", "Smart-turn end-of-turn inference time."
+        )
+        self.turn_stages = Histogram(
+            "interview_turn_stage_seconds",
+            "Time from the candidate stopping speaking to each stage of the bot's reply.",
+        )
+        self.speculation_saved = Histogram(
+            "interview_llm_speculation_saved_seconds",
+            "Reply latency saved by speculative LLM replies that were committed.",
+        )
+        self.llm_tokens = Counter("interview_llm_tokens_total", "LLM tokens used.")
+        self.tts_characters = Counter(
+            "interview_tts_characters_total", "Characters sent to text-to-speech."
+        )
+        self.speculations = Counter(
+            "interview_llm_speculations_total",
+            "Speculative LLM replies on interim transcripts, by outcome.",
+        )
+
+    @staticmethod
+    def _labels(data) -> Dict[str, str]:
+        processor = re.sub(r"#\d+$", "", data.processor)
+        return {
+            "service": service_of(processor),
+            "processor": processor,
+            "model": data.model or "",
+        }
+
+    def record_ttfb(self, data):
+        self.ttfb.observe(data.value, **self._labels(data))
+
+    def record_processing(self, data):
+        self.processing.observe(data.value, **self._labels(data))
+
+    def record_llm_usage(self, data):
+        labels = self._labels(data)
+        self.llm_tokens.inc(data.value.prompt_tokens, kind="prompt", **labels)
+        self.llm_tokens.inc(data.value.completion_tokens, kind="completion", **labels)
+
+    def record_tts_usage(self, data):
+        self.tts_characters.inc(data.value, **self._labels(data))
+
+    def record_smart_turn(self, data):
+        self.smart_turn.observe(data.inference_time_ms / 1000, **self._labels(data))
+
+    def render(self, extra: Iterable[List[str]] = ()) -> str:
+        sections = [
+            self.ttfb.render(),
+            self.processing.render(),
+            self.smart_turn.render(),
+            self.turn_stages.render(),
+            self.speculation_saved.render(),
+            self.llm_tokens.render(),
+            self.tts_characters.render(),
+            self.speculations.render(),
+            *extra,
+        ]
+        return "\n".join(line for section in sections for line in section) + "\n"
+
+
+# Process-wide metrics
+pipeline_metrics = PipelineMetrics()
@@ -0,0 +1,176 @@
+"""
+Shared, preloaded VAD and smart-turn models for all interview sessions.
+
+Loading Silero VAD and smart-turn v3 builds ONNX inference sessions (and a
+Whisper feature extractor), which is slow and holds a copy of the weights per
+session. The registry loads them once at startup; each WebRTC connection gets
+lightweight analyzers that keep only their own streaming state and run on the
+shared inference sessions (onnxruntime sessions are safe to run concurrently).
+Inference runs on the shared pools in inference_pool.py rather than a thread
+per analyzer, with smart-turn calls batched across sessions.
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import onnxruntime as ort
+from loguru import logger
+from pipecat.audio.turn.base_turn_analyzer import EndOfTurnState
+from pipecat.audio.turn.smart_turn.base_smart_turn import BaseSmartTurn, SmartTurnParams
+from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+from pipecat.audio.vad.silero import SileroOnnxModel, SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+from pipecat.metrics.metrics import SmartTurnMetricsData
+from transformers import WhisperFeatureExtractor
+
+from inference_pool import SmartTurnBatcher, inference_pool
+
+
+def _bundled_model_path(package_path: str, model_name: str) -> str:
+    from importlib import resources
+
+    return str(resources.files(package_path).joinpath(model_name))
+
+
+class _SessionSileroModel(SileroOnnxModel):
+    """Silero model state for one session, running on a shared ONNX session."""
+
+    def __init__(self, session: ort.InferenceSession):
+        self.session = session
+        self.reset_states()
+        self.sample_rates = [8000, 16000]
+
+
+class SharedSileroVADAnalyzer(SileroVADAnalyzer):
+    """SileroVADAnalyzer that reuses the registry's ONNX session and the shared VAD pool."""
+
+    def __init__(self, session: ort.InferenceSession, *, params: Optional[VADParams] = None):
+        # Skip SileroVADAnalyzer.__init__, which would load the model again
+        VADAnalyzer.__init__(self, sample_rate=None, params=params)
+        self._model = _SessionSileroModel(session)
+        self._last_reset_time = 0
+        self._executor = inference_pool.vad_executor
+
+    async def analyze_audio(self, buffer: bytes) -> VADState:
+        def run() -> Tuple[float, float, VADState]:
+            started = time.perf_counter()
+            state = self._run_analyzer(buffer)
+            return started, time.perf_counter(), state
+
+        enqueued = time.perf_counter()
+        started, finished, state = await asyncio.get_running_loop().run_in_executor(
+            self._executor, run
+        )
+        inference_pool.stats.record("vad", (started - enqueued) * 1000, (finished - started) * 1000)
+        return state
+
+
+class SharedSmartTurnAnalyzerV3(LocalSmartTurnAnalyzerV3):
+    """LocalSmartTurnAnalyzerV3 whose predictions go through the shared, batching pool."""
+
+    def __init__(self, batcher: SmartTurnBatcher, *, params: Optional[SmartTurnParams] = None):
+        # Skip LocalSmartTurnAnalyzerV3.__init__, which would load the model again
+        BaseSmartTurn.__init__(self, params=params)
+        self._batcher = batcher
+
+    def _speech_segment(self) -> Optional[np.ndarray]:
+        """The buffered speech (plus pre-speech padding), capped at max_duration_secs."""
+        if not self._audio_buffer:
+            return None
+        start_time = self._speech_start_time - (self._params.pre_speech_ms / 1000)
+        start_index = 0
+        for i, (t, _) in enumerate(self._audio_buffer):
+            if t >= start_time:
+                start_index = i
+                break
+        segment = np.concatenate([chunk for _, chunk in self._audio_buffer[start_index:]])
+        max_samples = int(self._params.max_duration_secs * self.sample_rate)
+        return segment[-max_samples:] if len(segment) > 0 else None
+
+    async def analyze_end_of_turn(self) -> Tuple[EndOfTurnState, Optional[SmartTurnMetricsData]]:
+        segment = self._speech_segment()
+        if segment is None:
+            return EndOfTurnState.INCOMPLETE, None
+
+        start = time.perf_counter()
+        result = await self._batcher.predict(segment)
+        state = EndOfTurnState.COMPLETE if result["prediction"] == 1 else EndOfTurnState.INCOMPLETE
+        if state == EndOfTurnState.COMPLETE:
+            self._clear(state)
+        logger.debug(f"End of Turn result: {state}")
+
+        return state, SmartTurnMetricsData(
+            processor="BaseSmartTurn",
+            is_complete=state == EndOfTurnState.COMPLETE,
+            probability=result["probability"],
+            inference_time_ms=result["inference_ms"],
+            server_total_time_ms=result["queue_wait_ms"] + result["inference_ms"],
+            e2e_processing_time_ms=(time.perf_counter() - start) * 1000,
+        )
+
+
+class ModelRegistry:
+    """Loads the VAD and smart-turn models once and hands out per-session analyzers."""
+
+    def __init__(self):
+        self.smart_turn_cpu_count = int(os.getenv("SMART_TURN_CPU_COUNT", 1))
+        self._silero_session: Optional[ort.InferenceSession] = None
+        self._smart_turn_session: Optional[ort.InferenceSession] = None
+        self._feature_extractor: Optional[WhisperFeatureExtractor] = None
+        self._smart_turn_batcher: Optional[SmartTurnBatcher] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._silero_session is not None and self._smart_turn_batcher is not None
+
+    def load(self):
+        """Create the shared inference sessions (blocking; call once at startup)."""
+        if self.loaded:
+            return
+
+        start = time.perf_counter()
+
+        opts = ort.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+        self._silero_session = ort.InferenceSession(
+            _bundled_model_path("pipecat.audio.vad.data", "silero_vad.onnx"),
+            providers=["CPUExecutionProvider"],
+            sess_options=opts,
+        )
+
+        so = ort.SessionOptions()
+        so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        so.inter_op_num_threads = 1
+        so.intra_op_num_threads = self.smart_turn_cpu_count
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._smart_turn_session = ort.InferenceSession(
+            _bundled_model_path("pipecat.audio.turn.smart_turn.data", "smart-turn-v3.1-cpu.onnx"),
+            sess_options=so,
+        )
+        self._feature_extractor = WhisperFeatureExtractor(chunk_length=8)
+        self._smart_turn_batcher = SmartTurnBatcher(
+            self._smart_turn_session,
+            self._feature_extractor,
+            inference_pool.smart_turn_executor,
+            inference_pool.stats,
+        )
+
+        logger.info(f"✅ VAD and smart-turn models loaded in {time.perf_counter() - start:.2f}s")
+
+    def vad_analyzer(self, params: Optional[VADParams] = None) -> SharedSileroVADAnalyzer:
+        """New per-session Silero VAD analyzer on the shared model."""
+        self.load()
+        return SharedSileroVADAnalyzer(self._silero_session, params=params)
+
+    def turn_analyzer(self, params: Optional[SmartTurnParams] = None) -> SharedSmartTurnAnalyzerV3:
+        """New per-session smart-turn v3 analyzer on the shared model."""
+        self.load()
+        return SharedSmartTurnAnalyzerV3(self._smart_turn_batcher, params=params)
+
+
+# Process-wide registry, loaded at startup
+model_registry = ModelRegistry()
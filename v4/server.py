@@ -10,53 +10,124 @@ This server:
 import os
 import sys
 import json
+import secrets
+import time
 import asyncio
+import importlib
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
 from loguru import logger
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
-from aiortc.sdp import candidate_from_sdp
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 
-load_dotenv(override=True)
+from admission import AdmissionRejected, admission, load_monitor, retry_after_header
+from loop_watchdog import LAG_BUCKETS_MS, loop_watchdog
+from metrics import family, histogram_from_counts, pipeline_metrics
+from sessions import process_rss_bytes, session_registry, setup_store
+from static_cache import StaticCache
 
-# Global storage for interview context
-interview_context = {"current": None}
+load_dotenv(override=True)
 
 # Global storage for transcripts (to send to frontend)
 transcript_buffer = []
 
 print("🚀 Starting Interview Server...")
-print("⏳ Loading AI models (may take 20 seconds on first run)\n")
-
-# Import pipecat components
-from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
-from pipecat.audio.vad.silero import SileroVADAnalyzer
-from pipecat.audio.vad.vad_analyzer import VADParams
-from pipecat.frames.frames import LLMRunFrame, TextFrame
-from pipecat.pipeline.pipeline import Pipeline
-from pipecat.pipeline.runner import PipelineRunner
-from pipecat.pipeline.task import PipelineParams, PipelineTask
-from pipecat.processors.aggregators.llm_context import LLMContext
-from pipecat.processors.aggregators.llm_response_universal import LLMContextAggregatorPair
-from pipecat.processors.frameworks.rtvi import RTVIConfig, RTVIObserver, RTVIProcessor
-from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
-from pipecat.services.cartesia.tts import CartesiaTTSService
-from pipecat.services.deepgram.stt import DeepgramSTTService
-from pipecat.services.azure.llm import AzureLLMService
-from pipecat.services.simli.video import SimliVideoService
-from pipecat.transports.base_transport import TransportParams
-from pipecat.transports.smallwebrtc.transport import SmallWebRTCTransport
-from pipecat.transports.smallwebrtc.connection import SmallWebRTCConnection
-
-logger.info("✅ All AI models loaded successfully!")
+
+# Warm-up state: the pipecat stack and models load in the background so the
+# HTTP app binds immediately (see /healthz and /readyz)
+warmup = {
+    "ready": False,
+    "error": None,
+    "timings": {},
+    "bot": None,  # lazily imported bot module
+}
+ready_event = asyncio.Event()
+
+# How long /api/offer waits for warm-up before refusing with 503
+OFFER_READY_TIMEOUT_SECS = float(os.getenv("OFFER_READY_TIMEOUT_SECS", 30))
+
+
+async def warm_up():
+    """Import pipecat and load the shared models off the event loop, timing each phase."""
+    try:
+        start = time.perf_counter()
+        logger.info("⏳ Importing pipecat services...")
+        bot = await asyncio.to_thread(importlib.import_module, "bot")
+        warmup["timings"]["import_secs"] = round(time.perf_counter() - start, 2)
+        logger.info(f"✅ Pipecat imported in {warmup['timings']['import_secs']}s")
+
+        start = time.perf_counter()
+        await asyncio.to_thread(bot.model_registry.load)
+        warmup["timings"]["models_secs"] = round(time.perf_counter() - start, 2)
+
+        warmup["bot"] = bot
+        warmup["ready"] = True
+        ready_event.set()
+        logger.info(f"✅ All AI models loaded successfully! {warmup['timings']}")
+    except Exception as e:
+        warmup["error"] = str(e)
+        logger.error(f"❌ Warm-up failed: {e}", exc_info=True)
+
+
+async def run_service_pool():
+    """Keep upstream service connections warm once pipecat is imported."""
+    await ready_event.wait()
+    await warmup["bot"].service_pool.run()
+
+
+async def wait_until_ready():
+    """Return the bot module once warm-up is done, or raise 503."""
+    if not warmup["ready"]:
+        try:
+            await asyncio.wait_for(ready_event.wait(), timeout=OFFER_READY_TIMEOUT_SECS)
+        except asyncio.TimeoutError:
+            pass
+    if not warmup["ready"]:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is warming up, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+    return warmup["bot"]
+
+
+async def admit_session():
+    """Take an admission slot for a new session, or raise 503 with an estimated wait."""
+    try:
+        await admission.acquire()
+    except AdmissionRejected as e:
+        logger.warning(f"🚦 Offer refused: {e.reason} (estimated wait {e.retry_after}s)")
+        raise HTTPException(
+            status_code=503,
+            detail={"error": f"Server busy: {e.reason}", "estimated_wait_secs": e.retry_after},
+            headers={"Retry-After": retry_after_header(e.retry_after)},
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start warm-up in the background so the app binds immediately."""
+    warmup_task = asyncio.create_task(warm_up())
+    reaper_task = asyncio.create_task(session_registry.run_reaper())
+    monitor_task = asyncio.create_task(load_monitor.run())
+    watchdog_task = asyncio.create_task(loop_watchdog.run())
+    pool_task = asyncio.create_task(run_service_pool())
+    session_registry.on_closed = lambda session: admission.release(session.age())
+    yield
+    warmup_task.cancel()
+    reaper_task.cancel()
+    monitor_task.cancel()
+    watchdog_task.cancel()
+    pool_task.cancel()
+    await session_registry.close_all()
+
 
 # Create FastAPI app
-app = FastAPI(title="AI Interview Coach")
+app = FastAPI(title="AI Interview Coach", lifespan=lifespan)
 
 # Add CORS
 app.add_middleware(
@@ -79,9 +150,26 @@ if frontend_dir.exists():
 print(f"📁 Current working directory: {os.getcwd()}")
 print(f"📁 __file__: {__file__}")
 
-# Mount static files (for JS, CSS, etc.) - only if directory exists
-if frontend_dir.exists():
-    app.mount("/static", StaticFiles(directory=frontend_dir), name="static")
+# Frontend files are served from memory, precompressed (see static_cache.py)
+static_cache = StaticCache(frontend_dir)
+static_cache.load()
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving HTTP."""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: pipecat is imported and the models are loaded."""
+    if warmup["ready"]:
+        return {"status": "ready", "timings": warmup["timings"]}
+    return JSONResponse(
+        {"status": "failed" if warmup["error"] else "warming_up", "error": warmup["error"], "timings": warmup["timings"]},
+        status_code=503,
+    )
 
 
 @app.get("/debug")
@@ -97,210 +185,233 @@ async def debug_info():
 
 
 @app.get("/")
-async def serve_index():
-    index_file = frontend_dir / "index.html"
-    if not index_file.exists():
+async def serve_index(request: Request):
+    response = static_cache.response(request, "index.html")
+    if response is None:
+        index_file = frontend_dir / "index.html"
         return JSONResponse({"error": "Frontend not found", "path": str(index_file)}, status_code=500)
-    return FileResponse(index_file)
+    return response
 
 
 @app.get("/{filename}.html")
-async def serve_html(filename: str):
-    file_path = frontend_dir / f"{filename}.html"
-    if file_path.exists():
-        return FileResponse(file_path)
+async def serve_html(filename: str, request: Request):
+    response = static_cache.response(request, f"{filename}.html")
+    if response is not None:
+        return response
     return JSONResponse({"error": "Not found"}, status_code=404)
 
 
 @app.get("/{filename}.js")
-async def serve_js(filename: str):
-    file_path = frontend_dir / f"{filename}.js"
-    if file_path.exists():
-        return FileResponse(file_path, media_type="application/javascript")
+async def serve_js(filename: str, request: Request):
+    response = static_cache.response(request, f"{filename}.js")
+    if response is not None:
+        return response
+    return JSONResponse({"error": "Not found"}, status_code=404)
+
+
+@app.get("/static/{path:path}")
+async def serve_static(path: str, request: Request):
+    response = static_cache.response(request, path)
+    if response is not None:
+        return response
     return JSONResponse({"error": "Not found"}, status_code=404)
 
 
 @app.post("/api/setup")
 async def receive_setup(request: Request):
-    """Receive interview setup before WebRTC connection."""
+    """Receive interview setup before WebRTC connection.
+
+    Returns a session token; send it with the offer so the bot for that
+    connection (and only that one) gets this setup.
+    """
     data = await request.json()
-    interview_context["current"] = data
+    session_token = setup_store.put(data)
     logger.info(f"📋 Received interview setup: {data}")
-    return {"status": "ok", "received": data}
+    if warmup["ready"]:
+        # Start on the greeting while the client negotiates WebRTC
+        warmup["bot"].greeting_prefetcher.prefetch(data)
+    return {"status": "ok", "received": data, "session_token": session_token}
 
 
 @app.get("/api/setup")
-async def get_setup():
-    """Get current interview setup."""
-    return {"setup": interview_context.get("current")}
-
-
-# Transcript processor to capture AI responses
-class TranscriptProcessor(FrameProcessor):
-    def __init__(self, connection: SmallWebRTCConnection):
-        super().__init__()
-        self._connection = connection
-        self._current_sentence = ""
-    
-    async def process_frame(self, frame, direction):
-        await super().process_frame(frame, direction)
-        
-        if isinstance(frame, TextFrame) and frame.text:
-            self._current_sentence += frame.text
-            # Send when we have a complete sentence
-            if any(p in frame.text for p in ['.', '!', '?', '\n']):
-                if self._current_sentence.strip():
-                    try:
-                        # Send via data channel using send_app_message (not async)
-                        msg = json.dumps({
-                            "type": "bot-transcription",
-                            "data": self._current_sentence.strip()
-                        })
-                        self._connection.send_app_message(msg)
-                        logger.info(f"📝 Sent transcript: {self._current_sentence.strip()[:50]}...")
-                    except Exception as e:
-                        logger.warning(f"Could not send transcript: {e}")
-                self._current_sentence = ""
-        
-        await self.push_frame(frame, direction)
-
-
-async def run_bot(connection: SmallWebRTCConnection, setup_data: dict = None):
-    """Run the interview bot for a connection."""
-    try:
-        logger.info(f"Starting bot with setup: {setup_data}")
-        
-        # Initialize services
-        stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
-        tts = CartesiaTTSService(
-            api_key=os.getenv("CARTESIA_API_KEY"),
-            voice_id="79a125e8-cd45-4c13-8a67-188112f4dd22",  # British Lady
-        )
-        llm = AzureLLMService(
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-        )
-        
-        # Simli AI Avatar - processes TTS audio and generates video
-        simli_ai = SimliVideoService(
-            api_key=os.getenv("SIMLI_API_KEY"),
-            face_id=os.getenv("SIMLI_FACE_ID"),
-        )
-        
-        # System prompt
-        system_prompt = """You are a professional AI interview coach conducting a realistic job interview practice session.
-
-Your role is to:
-- Ask relevant behavioral and technical interview questions
-- Listen actively to the candidate's responses
-- Ask thoughtful follow-up questions when appropriate
-- Maintain a professional but friendly demeanor
-- Help candidates improve their interview skills through practice
-- Keep responses concise and natural, as in a real interview
-
-Interview Guidelines:
-1. Tailor questions to the candidate's target role and experience level
-2. Ask about past projects, challenges, and achievements
-3. Probe for specific examples and details
-4. Ask 5-7 questions total, then conclude the interview
-5. End by thanking them and wishing them luck
-
-Keep your tone professional yet encouraging. Ask one question at a time and wait for responses."""
-
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        # Add context based on setup
-        if setup_data:
-            context_msg = f"""The candidate has provided the following information:
-- Target Position: {setup_data.get('jobTitle', 'Not specified')}
-- Company: {setup_data.get('company', 'Not specified')}
-- Interview Format: {setup_data.get('interviewFormat', 'Not specified')}
-- Experience: {setup_data.get('experience', 'Not specified')}
-
-Greet the candidate warmly by acknowledging you know they're preparing for the {setup_data.get('jobTitle', 'position')} role at {setup_data.get('company', 'their target company')}. Start with your first interview question directly - do NOT ask them what role they're preparing for since you already know."""
-            messages.append({"role": "system", "content": context_msg})
-        else:
-            messages.append({
-                "role": "system", 
-                "content": "Greet the candidate warmly and ask what job role they are preparing to interview for. Keep it brief and professional."
-            })
-        
-        context = LLMContext(messages)
-        context_aggregator = LLMContextAggregatorPair(context)
-        rtvi = RTVIProcessor(config=RTVIConfig(config=[]))
-        
-        # Create transport with video output enabled for Simli avatar
-        transport = SmallWebRTCTransport(
-            webrtc_connection=connection,
-            params=TransportParams(
-                audio_in_enabled=True,
-                audio_out_enabled=True,
-                video_out_enabled=True,
-                video_out_is_live=True,
-                video_out_width=512,
-                video_out_height=512,
-                vad_analyzer=SileroVADAnalyzer(params=VADParams(stop_secs=0.5)),
-                turn_analyzer=LocalSmartTurnAnalyzerV3(),
-            ),
-        )
-        
-        # Create transcript processor
-        transcript_processor = TranscriptProcessor(connection)
-        
-        pipeline = Pipeline([
-            transport.input(),
-            rtvi,
-            stt,
-            context_aggregator.user(),
-            llm,
-            transcript_processor,
-            tts,
-            simli_ai,  # Simli processes TTS audio and outputs video frames
-            transport.output(),
-            context_aggregator.assistant(),
-        ])
-        
-        task = PipelineTask(
-            pipeline,
-            params=PipelineParams(enable_metrics=True, enable_usage_metrics=True),
-            observers=[RTVIObserver(rtvi)],
-        )
-        
-        @transport.event_handler("on_client_connected")
-        async def on_client_connected(transport, client):
-            logger.info("Client connected - Starting interview")
-            await task.queue_frames([LLMRunFrame()])
-        
-        @transport.event_handler("on_client_disconnected")
-        async def on_client_disconnected(transport, client):
-            logger.info("Client disconnected")
-            await task.cancel()
-        
-        runner = PipelineRunner(handle_sigint=False)
-        await runner.run(task)
-    
-    except Exception as e:
-        logger.error(f"❌ Bot execution failed: {str(e)}", exc_info=True)
-        # Don't crash the server, just log the error
-
-
-# Store active connections
-connections = {}
+async def get_setup(session_token: str = None):
+    """Get the interview setup stored under a session token."""
+    return {"setup": setup_store.get(session_token)}
+
+
+@app.get("/api/inference")
+async def inference_stats():
+    """Queue-wait and inference timings for the shared VAD and smart-turn pools."""
+    if not warmup["ready"]:
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    from inference_pool import inference_pool
+
+    return inference_pool.snapshot()
+
+
+@app.get("/api/tts-cache")
+async def tts_cache_stats():
+    """Hit rate and bytes saved by the on-disk TTS cache."""
+    if not warmup["ready"]:
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    from tts_cache import tts_cache
+
+    return tts_cache.snapshot()
+
+
+@app.get("/api/greetings")
+async def greeting_stats():
+    """How often the greeting prepared during negotiation was ready on connect."""
+    if not warmup["ready"]:
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    from greetings import greeting_prefetcher
+
+    return greeting_prefetcher.snapshot()
+
+
+@app.get("/api/service-pool")
+async def service_pool_stats():
+    """Idle pre-opened upstream connections and how often sessions found one."""
+    if not warmup["ready"]:
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    from service_pool import service_pool
+
+    return service_pool.snapshot()
+
+
+@app.get("/api/video-quality")
+async def video_quality_stats():
+    """Video profiles in use and how often sessions stepped down or lost the avatar."""
+    if not warmup["ready"]:
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    from video_quality import video_governor
+
+    return video_governor.snapshot()
+
+
+@app.get("/api/speculation")
+async def llm_speculation_stats():
+    """Hit and miss rates of speculative LLM replies and the latency they saved."""
+    if not warmup["ready"]:
+        return JSONResponse({"status": "warming_up"}, status_code=503)
+    from speculative_llm import speculation_stats
+
+    return speculation_stats.snapshot()
+
+
+@app.get("/api/loop-stats")
+async def loop_stats():
+    """Event-loop lag histogram and recent stalls with the blocking stacks."""
+    return loop_watchdog.snapshot()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-service pipeline latency and usage, sessions and load."""
+    sessions = session_registry.snapshot()
+    load = admission.snapshot()
+    extra = [
+        family(
+            "interview_sessions",
+            "Open WebRTC sessions by state.",
+            "gauge",
+            {(("state", state),): count for state, count in sessions["counts"].items()},
+        ),
+        family(
+            "interview_sessions_closed_total",
+            "Sessions closed, including reaped ones.",
+            "counter",
+            {(): sessions["closed_total"]},
+        ),
+        family(
+            "interview_sessions_reaped_total",
+            "Sessions closed by the reaper.",
+            "counter",
+            {(): sessions["reaped_total"]},
+        ),
+        family(
+            "interview_admission_sessions",
+            "Admitted sessions and offers waiting in the admission queue.",
+            "gauge",
+            {(("status", "active"),): load["active"], (("status", "queued"),): load["queued"]},
+        ),
+        family(
+            "interview_admission_max_sessions",
+            "Session limit of this process.",
+            "gauge",
+            {(): load["max_sessions"]},
+        ),
+        family(
+            "interview_admission_offers_total",
+            "Offers by admission outcome.",
+            "counter",
+            {
+                (("outcome", "admitted"),): load["admitted_total"],
+                (("outcome", "queued"),): load["queued_total"],
+                (("outcome", "rejected"),): load["rejected_total"],
+            },
+        ),
+        family(
+            "interview_cpu_percent",
+            "Smoothed process CPU usage.",
+            "gauge",
+            {(): load["cpu_percent"]},
+        ),
+        family(
+            "interview_process_resident_memory_bytes",
+            "Resident memory of this process.",
+            "gauge",
+            {(): process_rss_bytes()},
+        ),
+        histogram_from_counts(
+            "interview_event_loop_lag_seconds",
+            "Event-loop timer lateness sampled by the watchdog.",
+            [bound / 1000 for bound in LAG_BUCKETS_MS],
+            loop_watchdog.bucket_counts,
+            loop_watchdog.lag_sum_ms / 1000,
+        ),
+    ]
+    return PlainTextResponse(
+        pipeline_metrics.render(extra), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/api/sessions")
+async def list_sessions():
+    """Open WebRTC sessions by state, with estimated memory per session."""
+    return {**session_registry.snapshot(), "admission": admission.snapshot()}
+
+
+@app.get("/api/sessions/{pc_id}/timeline")
+async def session_timeline(pc_id: str):
+    """Recent turns of a session with per-stage voice-to-voice latency."""
+    session = session_registry.get(pc_id)
+    if not session:
+        return JSONResponse({"error": "Connection not found"}, status_code=404)
+    return {"pc_id": pc_id, **session.timeline.snapshot()}
 
 
 @app.post("/api/offer")
 async def handle_offer(request: Request):
     """Handle WebRTC SDP offer."""
+    # Wait for (or refuse while) the models warm up
+    bot = await wait_until_ready()
+    # Wait for (or refuse without) a free session slot
+    await admit_session()
+    session = None
+    
     try:
         data = await request.json()
         logger.info(f"📥 Received offer: {data.get('type', 'offer')}")
         
-        # Capture request_data if provided
+        # Setup for this connection: sent inline with the offer, or posted
+        # earlier to /api/setup under a session token
+        session_token = data.get("session_token")
+        setup_data = data.get("request_data") or setup_store.get(session_token)
         if data.get("request_data"):
-            interview_context["current"] = data["request_data"]
             logger.info(f"📋 Captured setup from offer: {data['request_data']}")
+        # No-op if /api/setup already started it
+        bot.greeting_prefetcher.prefetch(setup_data)
         
         # Configure ICE servers (STUN/TURN) for WebRTC connectivity
         # Using string URLs format
@@ -312,21 +423,21 @@ async def handle_offer(request: Request):
         ]
         
         # Create WebRTC connection with ICE servers
-        connection = SmallWebRTCConnection(ice_servers=ice_servers)
-        
-        # Get the current setup
-        setup_data = interview_context.get("current")
+        connection = bot.SmallWebRTCConnection(ice_servers=ice_servers)
         
         # Initialize with the offer SDP and get answer
         await connection.initialize(data["sdp"], data.get("type", "offer"))
         answer = connection.get_answer()  # Not async - returns dict directly
         
-        # Generate connection ID
-        pc_id = connection.pc_id or str(id(connection))
-        connections[pc_id] = connection
+        # Generate connection ID; pipecat numbers connections per process, so add
+        # a random suffix to keep ids unique across workers and restarts
+        pc_id = f"{connection.pc_id or id(connection)}-{secrets.token_hex(4)}"
+        session = session_registry.add(
+            pc_id, connection, setup=setup_data, session_token=session_token
+        )
         
-        # Start the bot in background
-        asyncio.create_task(run_bot(connection, setup_data))
+        # Start the bot in background; the session is cleaned up when it exits
+        session_registry.start_bot(pc_id, bot.run_bot(connection, session.setup, session.timeline))
         
         logger.info(f"✅ Offer handled successfully, pc_id: {pc_id}")
         return {
@@ -335,6 +446,8 @@ async def handle_offer(request: Request):
             "pc_id": pc_id
         }
     except Exception as e:
+        if session is None:
+            admission.release()
         logger.error(f"❌ Error handling offer: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -342,14 +455,20 @@ async def handle_offer(request: Request):
 @app.patch("/api/offer")
 async def handle_ice_candidate(request: Request):
     """Handle ICE candidates."""
+    from aiortc.sdp import candidate_from_sdp
+    
     try:
         data = await request.json()
         pc_id = data.get("pc_id")
         candidates = data.get("candidates", [])
         
-        connection = connections.get(pc_id)
-        if not connection:
+        session = session_registry.get(pc_id)
+        if not session:
+            return JSONResponse({"error": "Connection not found"}, status_code=404)
+        # A connection offered with a token only takes candidates sent with that token
+        if session.session_token and data.get("session_token") != session.session_token:
             return JSONResponse({"error": "Connection not found"}, status_code=404)
+        connection = session.connection
         
         for candidate in candidates:
             # Parse the candidate string and create RTCIceCandidate object
@@ -372,6 +491,19 @@ async def handle_ice_candidate(request: Request):
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 7860))
+    host = os.getenv("HOST", "0.0.0.0")
+    workers = int(os.getenv("WORKERS", 1))
+    if "--worker-port" in sys.argv:
+        # Started by supervisor.py: one loopback server, whatever .env says
+        port = int(sys.argv[sys.argv.index("--worker-port") + 1])
+        host, workers = "127.0.0.1", 1
+
+    if workers > 1:
+        # Front process: spread sessions over worker processes (see supervisor.py)
+        print(f"🎯 AI Interview Coach supervisor with {workers} workers on http://localhost:{port}")
+        uvicorn.run("supervisor:app", host=host, port=port, log_level="info")
+        sys.exit(0)
+
     print("\n" + "=" * 60)
     print("🎯 AI Interview Coach Server")
     print("=" * 60)
@@ -379,9 +511,12 @@ if __name__ == "__main__":
     print(f"Open in browser: http://localhost:{port}")
     print()
     print("API Endpoints:")
+    print("  GET  /healthz    - Liveness")
+    print("  GET  /readyz     - Readiness (models loaded)")
     print("  POST /api/setup  - Set interview context")
     print("  POST /api/offer  - WebRTC SDP exchange")
+    print("  GET  /api/sessions - Open sessions")
     print("  PATCH /api/offer - ICE candidates")
     print("=" * 60 + "\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
+    uvicorn.run(app, host=host, port=port, log_level="info")
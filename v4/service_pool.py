@@ -0,0 +1,380 @@
+"""
+Warm pool of upstream connections for the per-session services.
+
+Every session used to open its own Cartesia websocket, Deepgram live socket and
+Simli session while its pipeline started, so the handshakes ran in series on
+the way to the first turn. `ServicePool` keeps a few of these connections open
+and healthy in the background; the `Warm*` services below take one from the
+pool when their pipeline starts and only connect themselves when none is
+available. The Azure OpenAI client (and its keep-alive HTTP connections) is
+shared by all sessions and the greeting prefetcher.
+
+Connection parameters are learned from the services themselves, so a kind is
+only pre-connected once a session has used it, and a pooled connection is only
+handed to a service whose parameters match.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import httpx
+from deepgram import LiveTranscriptionEvents
+from loguru import logger
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+from pipecat.services.azure.llm import AzureLLMService
+from pipecat.services.deepgram.stt import DeepgramSTTService
+from pipecat.services.simli.video import SimliVideoService
+from simli import SimliClient
+from websockets.asyncio.client import connect as websocket_connect
+from websockets.protocol import State
+
+from tts_cache import CachedCartesiaTTSService
+
+
+def params_key(params: Dict) -> str:
+    material = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+@dataclass
+class Idle:
+    connection: Any
+    key: str
+    created_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class ConnectionKind:
+    """One kind of upstream connection and how to open, check and close it."""
+
+    name: str
+    size: int  # Cap on idle connections kept open
+    max_idle_secs: float
+    connect: Callable[[Dict], Awaitable[Any]]
+    alive: Callable[[Any], Awaitable[bool]]
+    close: Callable[[Any], Awaitable[None]]
+    params: Optional[Dict] = None  # Learned from the last service that connected
+    idle: Deque[Idle] = field(default_factory=deque)
+    stats: Dict[str, int] = field(
+        default_factory=lambda: {"taken": 0, "missed": 0, "opened": 0, "expired": 0, "failed": 0}
+    )
+
+
+class ServicePool:
+    def __init__(self):
+        self.enabled = os.getenv("SERVICE_POOL", "true").lower() == "true"
+        self.check_interval_secs = float(os.getenv("SERVICE_POOL_CHECK_SECS", 5))
+        self.max_idle_secs = float(os.getenv("SERVICE_POOL_MAX_IDLE_SECS", 120))
+        self.kinds: Dict[str, ConnectionKind] = {
+            "cartesia": ConnectionKind(
+                name="cartesia",
+                size=int(os.getenv("SERVICE_POOL_CARTESIA", 2)),
+                max_idle_secs=self.max_idle_secs,
+                connect=self._connect_cartesia,
+                alive=self._cartesia_alive,
+                close=self._close_cartesia,
+            ),
+            "deepgram": ConnectionKind(
+                name="deepgram",
+                size=int(os.getenv("SERVICE_POOL_DEEPGRAM", 2)),
+                max_idle_secs=self.max_idle_secs,
+                connect=self._connect_deepgram,
+                alive=self._deepgram_alive,
+                close=self._close_deepgram,
+            ),
+            # Simli bills per session minute and ends sessions idle for ~30s, so its
+            # pool is off unless sized explicitly and connections are recycled sooner
+            "simli": ConnectionKind(
+                name="simli",
+                size=int(os.getenv("SERVICE_POOL_SIMLI", 0)),
+                max_idle_secs=float(os.getenv("SERVICE_POOL_SIMLI_MAX_IDLE_SECS", 20)),
+                connect=self._connect_simli,
+                alive=self._simli_alive,
+                close=self._close_simli,
+            ),
+        }
+        self._refill = asyncio.Event()
+        self._llm_clients: Dict[Tuple, AsyncAzureOpenAI] = {}
+        self._llm_warmed_at: Optional[float] = None
+
+    # Handing connections to services
+
+    def learn(self, kind: str, params: Dict):
+        """Remember how a service connects, so the pool can open the same connections."""
+        self.kinds[kind].params = params
+        self._refill.set()
+
+    async def take(self, kind: str, params: Dict) -> Optional[Any]:
+        """A healthy idle connection opened with these params, or None."""
+        pool_kind = self.kinds[kind]
+        self.learn(kind, params)
+        if not self.enabled or pool_kind.size <= 0:
+            return None
+        key = params_key(self._identity(params))
+        while pool_kind.idle:
+            idle = pool_kind.idle.popleft()
+            if idle.key == key and await self._usable(pool_kind, idle):
+                pool_kind.stats["taken"] += 1
+                logger.debug(f"♨️ Using a warm {kind} connection")
+                return idle.connection
+            await self._discard(pool_kind, idle)
+        pool_kind.stats["missed"] += 1
+        return None
+
+    @staticmethod
+    def _identity(params: Dict) -> Dict:
+        # Client objects are not part of what makes two connections interchangeable
+        return {k: v for k, v in params.items() if not k.startswith("_")}
+
+    async def _usable(self, kind: ConnectionKind, idle: Idle) -> bool:
+        if time.monotonic() - idle.created_at > kind.max_idle_secs:
+            return False
+        try:
+            return await kind.alive(idle.connection)
+        except Exception:
+            return False
+
+    async def _discard(self, kind: ConnectionKind, idle: Idle):
+        kind.stats["expired"] += 1
+        try:
+            await kind.close(idle.connection)
+        except Exception as e:
+            logger.debug(f"Closing idle {kind.name} connection failed: {e}")
+
+    # Background maintenance
+
+    async def run(self):
+        """Health-check idle connections and top each kind up to its size. Cancel to stop."""
+        if not self.enabled:
+            return
+        logger.info("♨️ Service connection pool on")
+        try:
+            while True:
+                for kind in self.kinds.values():
+                    await self._maintain(kind)
+                await self._maintain_llm()
+                self._refill.clear()
+                try:
+                    await asyncio.wait_for(self._refill.wait(), timeout=self.check_interval_secs)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.close_all()
+
+    async def _maintain(self, kind: ConnectionKind):
+        healthy: Deque[Idle] = deque()
+        current = params_key(self._identity(kind.params)) if kind.params else None
+        while kind.idle:
+            idle = kind.idle.popleft()
+            if idle.key == current and await self._usable(kind, idle):
+                healthy.append(idle)
+            else:
+                await self._discard(kind, idle)
+        kind.idle = healthy
+
+        if kind.params is None:
+            return
+        while len(kind.idle) < kind.size:
+            params = kind.params
+            try:
+                connection = await kind.connect(params)
+            except Exception as e:
+                # Try again on the next check rather than hammering the upstream
+                kind.stats["failed"] += 1
+                logger.warning(f"Could not pre-connect {kind.name}: {e}")
+                return
+            kind.idle.append(Idle(connection, params_key(self._identity(params))))
+            kind.stats["opened"] += 1
+
+    async def close_all(self):
+        for kind in self.kinds.values():
+            while kind.idle:
+                await self._discard(kind, kind.idle.popleft())
+
+    # Shared LLM client
+
+    def llm_client(
+        self, api_key: str = None, endpoint: str = None, api_version: str = None
+    ) -> AsyncAzureOpenAI:
+        """The Azure OpenAI client shared by every session (defaults from the environment)."""
+        config = (
+            api_key or os.getenv("AZURE_OPENAI_API_KEY"),
+            endpoint or os.getenv("AZURE_OPENAI_ENDPOINT"),
+            api_version or os.getenv("AZURE_OPENAI_API_VERSION"),
+        )
+        if config not in self._llm_clients:
+            self._llm_clients[config] = AsyncAzureOpenAI(
+                api_key=config[0],
+                azure_endpoint=config[1],
+                api_version=config[2],
+                # Keep idle connections (and their TLS sessions) for the next request
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_keepalive_connections=100, max_connections=1000, keepalive_expiry=None
+                    )
+                ),
+            )
+        return self._llm_clients[config]
+
+    async def _maintain_llm(self):
+        """Keep a connection to the Azure endpoint open with a cheap request now and then."""
+        if not os.getenv("AZURE_OPENAI_ENDPOINT"):
+            return
+        now = time.monotonic()
+        if self._llm_warmed_at and now - self._llm_warmed_at < self.max_idle_secs:
+            return
+        self._llm_warmed_at = now
+        try:
+            clients = list(self._llm_clients.values()) or [self.llm_client()]
+        except Exception as e:
+            logger.debug(f"No LLM client to warm up: {e}")
+            return
+        for client in clients:
+            try:
+                await client.models.list()
+            except Exception as e:
+                logger.debug(f"LLM connection warm-up request failed: {e}")
+
+    # Cartesia
+
+    @staticmethod
+    async def _connect_cartesia(params: Dict):
+        return await websocket_connect(params["url"])
+
+    @staticmethod
+    async def _cartesia_alive(websocket) -> bool:
+        return websocket.state is State.OPEN
+
+    @staticmethod
+    async def _close_cartesia(websocket):
+        await websocket.close()
+
+    # Deepgram
+
+    @staticmethod
+    async def _connect_deepgram(params: Dict):
+        connection = params["_client"].listen.asyncwebsocket.v("1")
+        if not await connection.start(options=params["settings"], addons=params["addons"]):
+            raise ConnectionError("Deepgram refused the connection")
+        return connection
+
+    @staticmethod
+    async def _deepgram_alive(connection) -> bool:
+        return await connection.is_connected()
+
+    @staticmethod
+    async def _close_deepgram(connection):
+        await connection.finish()
+
+    # Simli
+
+    @staticmethod
+    async def _connect_simli(params: Dict):
+        client = params["_factory"]()
+        await client.Initialize()
+        return client
+
+    @staticmethod
+    async def _simli_alive(client) -> bool:
+        return client.run and client.ready.is_set()
+
+    @staticmethod
+    async def _close_simli(client):
+        await client.stop()
+
+    def snapshot(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "kinds": {
+                name: {
+                    "size": kind.size,
+                    "idle": len(kind.idle),
+                    "learned": kind.params is not None,
+                    **kind.stats,
+                }
+                for name, kind in self.kinds.items()
+            },
+        }
+
+
+# Process-wide pool
+service_pool = ServicePool()
+
+
+class WarmCartesiaTTSService(CachedCartesiaTTSService):
+    """Cartesia TTS that starts on a pre-opened websocket when one is available."""
+
+    async def _connect_websocket(self):
+        if self._websocket and self._websocket.state is State.OPEN:
+            return
+        url = f"{self._url}?api_key={self._api_key}&cartesia_version={self._cartesia_version}"
+        websocket = await service_pool.take("cartesia", {"url": url})
+        if websocket is None:
+            await super()._connect_websocket()
+            return
+        self._websocket = websocket
+        await self._call_event_handler("on_connected")
+
+
+class WarmDeepgramSTTService(DeepgramSTTService):
+    """Deepgram STT that starts on a pre-opened live connection when one is available."""
+
+    async def _connect(self):
+        params = {"settings": dict(self._settings), "addons": self._addons, "_client": self._client}
+        connection = await service_pool.take("deepgram", params)
+        if connection is None:
+            await super()._connect()
+            return
+
+        self._connection = connection
+        self._connection.on(
+            LiveTranscriptionEvents(LiveTranscriptionEvents.Transcript), self._on_message
+        )
+        self._connection.on(LiveTranscriptionEvents(LiveTranscriptionEvents.Error), self._on_error)
+        if self.vad_enabled:
+            self._connection.on(
+                LiveTranscriptionEvents(LiveTranscriptionEvents.SpeechStarted),
+                self._on_speech_started,
+            )
+            self._connection.on(
+                LiveTranscriptionEvents(LiveTranscriptionEvents.UtteranceEnd),
+                self._on_utterance_end,
+            )
+
+
+class WarmSimliVideoService(SimliVideoService):
+    """Simli avatar that starts on a pre-initialized session when one is available."""
+
+    async def _start_connection(self):
+        if not self._initialized:
+            template = self._simli_client
+            params = {
+                "face_id": template.config.faceId,
+                "max_idle_time": template.config.maxIdleTime,
+                "max_session_length": template.config.maxSessionLength,
+                "url": template.simliHTTPURL,
+                "_factory": lambda: SimliClient(
+                    config=template.config,
+                    latencyInterval=template.latencyInterval,
+                    simliURL=template.simliHTTPURL,
+                    enable_logging=template.enable_logging,
+                ),
+            }
+            client = await service_pool.take("simli", params)
+            if client is not None:
+                self._simli_client = client
+                self._initialized = True
+        await super()._start_connection()
+
+
+class WarmAzureLLMService(AzureLLMService):
+    """Azure OpenAI LLM on the shared, already-connected client."""
+
+    def create_client(self, api_key=None, base_url=None, **kwargs):
+        return service_pool.llm_client(api_key, self._endpoint, self._api_version)
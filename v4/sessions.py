@@ -0,0 +1,266 @@
+"""
+Session registry for the WebRTC interview connections.
+
+Every offer creates a `SmallWebRTCConnection` and a `run_bot` task. The registry
+tracks them through their lifecycle (negotiating -> active -> closing -> closed)
+and drops them as soon as the client disconnects, the peer connection fails or
+the bot exits, so a long-running process does not accumulate dead peer
+connections and pipelines. A background reaper closes negotiations that never
+complete and sessions that outlive the maximum duration.
+"""
+
+import asyncio
+import os
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from loop_watchdog import set_session_id
+from turn_timeline import TurnTimeline
+
+
+class SessionState(str, Enum):
+    NEGOTIATING = "negotiating"
+    ACTIVE = "active"
+    CLOSING = "closing"
+    CLOSED = "closed"
+
+
+@dataclass
+class Session:
+    pc_id: str
+    connection: Any
+    state: SessionState = SessionState.NEGOTIATING
+    created_at: float = field(default_factory=time.monotonic)
+    updated_at: float = field(default_factory=time.monotonic)
+    task: Optional[asyncio.Task] = None
+    setup: Optional[dict] = None
+    session_token: Optional[str] = None
+    close_reason: Optional[str] = None
+    timeline: TurnTimeline = field(default_factory=TurnTimeline)
+
+    def set_state(self, state: SessionState):
+        self.state = state
+        self.updated_at = time.monotonic()
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux), or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SessionRegistry:
+    """Tracks live WebRTC sessions and cleans them up when they end."""
+
+    def __init__(self):
+        self.negotiation_ttl_secs = float(os.getenv("SESSION_NEGOTIATION_TTL_SECS", 60))
+        self.max_duration_secs = float(os.getenv("SESSION_MAX_DURATION_SECS", 3600))
+        self.reap_interval_secs = float(os.getenv("SESSION_REAP_INTERVAL_SECS", 15))
+        self._sessions: Dict[str, Session] = {}
+        self._closed_total = 0
+        self._reaped_total = 0
+        # RSS with no sessions attached, used to estimate per-session memory
+        self._baseline_rss: Optional[int] = None
+        # Called with each session once it has been closed (e.g. to free its admission slot)
+        self.on_closed: Optional[Callable[[Session], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(
+        self,
+        pc_id: str,
+        connection,
+        setup: Optional[dict] = None,
+        session_token: Optional[str] = None,
+    ) -> Session:
+        """Register a connection that is negotiating and hook its lifecycle events."""
+        if not self._sessions:
+            self._baseline_rss = process_rss_bytes()
+
+        session = Session(
+            pc_id=pc_id, connection=connection, setup=setup, session_token=session_token
+        )
+        self._sessions[pc_id] = session
+
+        @connection.event_handler("connected")
+        async def on_connected(connection):
+            self.mark_active(pc_id)
+
+        @connection.event_handler("closed")
+        async def on_closed(connection):
+            await self.close(pc_id, "peer connection closed")
+
+        @connection.event_handler("failed")
+        async def on_failed(connection):
+            await self.close(pc_id, "peer connection failed")
+
+        logger.info(f"🆕 Session {pc_id} negotiating ({len(self._sessions)} open)")
+        return session
+
+    def get(self, pc_id: str) -> Optional[Session]:
+        return self._sessions.get(pc_id)
+
+    def mark_active(self, pc_id: str):
+        session = self._sessions.get(pc_id)
+        if session and session.state == SessionState.NEGOTIATING:
+            session.set_state(SessionState.ACTIVE)
+            logger.info(f"🟢 Session {pc_id} active")
+
+    def start_bot(self, pc_id: str, coro) -> asyncio.Task:
+        """Run the bot for a session; the session is closed whenever the bot exits."""
+
+        async def run():
+            # Pipeline tasks created by the bot inherit the id, so stalls name the session
+            set_session_id(pc_id)
+            try:
+                await coro
+            finally:
+                await self.close(pc_id, "bot finished")
+
+        task = asyncio.create_task(run())
+        # No-op once finished; avoids "never awaited" if cancelled before it starts
+        task.add_done_callback(lambda _: coro.close())
+        session = self._sessions.get(pc_id)
+        if session:
+            session.task = task
+        return task
+
+    async def close(self, pc_id: str, reason: str):
+        """Disconnect the peer, cancel the bot and forget the session (idempotent)."""
+        session = self._sessions.get(pc_id)
+        if session is None or session.state in (SessionState.CLOSING, SessionState.CLOSED):
+            return
+
+        session.set_state(SessionState.CLOSING)
+        session.close_reason = reason
+        try:
+            await session.connection.disconnect()
+        except Exception as e:
+            logger.warning(f"Could not disconnect session {pc_id}: {e}")
+
+        task = session.task
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+
+        session.set_state(SessionState.CLOSED)
+        self._sessions.pop(pc_id, None)
+        self._closed_total += 1
+        if self.on_closed is not None:
+            self.on_closed(session)
+        logger.info(
+            f"🔚 Session {pc_id} closed after {session.age():.0f}s: {reason} "
+            f"({len(self._sessions)} open)"
+        )
+
+    async def close_all(self, reason: str = "server shutdown"):
+        for pc_id in list(self._sessions):
+            await self.close(pc_id, reason)
+
+    async def reap(self):
+        """Close half-open negotiations and sessions past their maximum duration."""
+        for session in list(self._sessions.values()):
+            if session.state == SessionState.NEGOTIATING:
+                if session.age() > self.negotiation_ttl_secs:
+                    self._reaped_total += 1
+                    await self.close(session.pc_id, "negotiation timed out")
+            elif self.max_duration_secs > 0 and session.age() > self.max_duration_secs:
+                self._reaped_total += 1
+                await self.close(session.pc_id, "maximum session duration reached")
+
+    async def run_reaper(self):
+        while True:
+            await asyncio.sleep(self.reap_interval_secs)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error(f"❌ Session reaper failed: {e}", exc_info=True)
+
+    def snapshot(self) -> Dict:
+        """Counts by state plus an even split of the memory used above the idle baseline."""
+        counts = {state.value: 0 for state in SessionState}
+        for session in self._sessions.values():
+            counts[session.state.value] += 1
+
+        rss = process_rss_bytes()
+        per_session_mb = None
+        if rss is not None and self._baseline_rss is not None and self._sessions:
+            used = max(0, rss - self._baseline_rss)
+            per_session_mb = round(used / len(self._sessions) / 2**20, 1)
+
+        return {
+            "open": len(self._sessions),
+            "counts": counts,
+            "closed_total": self._closed_total,
+            "reaped_total": self._reaped_total,
+            "process_rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+            "baseline_rss_mb": (
+                round(self._baseline_rss / 2**20, 1) if self._baseline_rss is not None else None
+            ),
+            "sessions": [
+                {
+                    "pc_id": session.pc_id,
+                    "state": session.state.value,
+                    "age_secs": round(session.age(), 1),
+                    "est_memory_mb": per_session_mb,
+                }
+                for session in self._sessions.values()
+            ],
+        }
+
+
+class SetupStore:
+    """
+    Interview setups posted before the WebRTC offer, keyed by a session token.
+
+    Bounded (oldest entries are evicted first) and entries expire, so setups
+    that are never followed by an offer do not pile up.
+    """
+
+    def __init__(self):
+        self.ttl_secs = float(os.getenv("SETUP_TTL_SECS", 900))
+        self.max_entries = int(os.getenv("SETUP_MAX_ENTRIES", 1000))
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._entries)
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._entries:
+            token, (stored_at, _) = next(iter(self._entries.items()))
+            if now - stored_at <= self.ttl_secs:
+                break
+            del self._entries[token]
+
+    def put(self, setup: dict) -> str:
+        """Store a setup under a new unguessable token and return the token."""
+        self._expire()
+        token = secrets.token_urlsafe(16)
+        self._entries[token] = (time.monotonic(), setup)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return token
+
+    def get(self, token: Optional[str]) -> Optional[dict]:
+        self._expire()
+        entry = self._entries.get(token) if token else None
+        return entry[1] if entry else None
+
+
+# Process-wide registry and setup store
+session_registry = SessionRegistry()
+setup_store = SetupStore()
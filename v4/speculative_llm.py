@@ -0,0 +1,276 @@
+"""
+Speculative LLM replies on interim transcripts.
+
+The LLM used to start only once the user turn was final: VAD silence
+(`stop_secs=0.5`), then the smart-turn decision, then the aggregated final
+transcript, so the whole Azure round trip came after the candidate stopped.
+With `SPECULATIVE_LLM=true`, `SpeculationTrigger` starts a completion on the
+transcript so far (finals plus the latest interim) as soon as VAD hears a
+pause, while the end-of-turn decision is still pending, and restarts it if the
+transcript changes. The completion streams into a buffer. When the real turn
+reaches the LLM, `SpeculativeAzureLLMService` replays the buffer, and the rest
+of the stream, if the history is unchanged and the final transcript is close
+enough to the speculated one; otherwise, or when the candidate resumes
+speaking, the speculation is cancelled and the reply is generated as usual.
+"""
+
+import asyncio
+import difflib
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Dict, List, Optional
+
+from loguru import logger
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InterimTranscriptionFrame,
+    InterruptionFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from metrics import pipeline_metrics
+from service_pool import WarmAzureLLMService
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    """Word-level similarity of two transcripts, ignoring case and punctuation."""
+    words_a = re.findall(r"[\w']+", a.lower())
+    words_b = re.findall(r"[\w']+", b.lower())
+    if words_a == words_b:
+        return 1.0
+    return difflib.SequenceMatcher(None, words_a, words_b).ratio()
+
+
+class SpeculationStats:
+    """Outcomes and latency saved by speculative replies, across sessions."""
+
+    def __init__(self):
+        self.enabled = os.getenv("SPECULATIVE_LLM", "false").lower() == "true"
+        self.min_similarity = float(os.getenv("SPECULATIVE_LLM_MIN_SIMILARITY", 0.9))
+        self.started = 0
+        self.counts = {"hit": 0, "miss": 0, "cancelled": 0, "superseded": 0}
+        self.failed = 0
+        self.saved_secs_total = 0.0
+
+    def record(self, outcome: str, saved_secs: Optional[float] = None):
+        """Count how a speculation ended: hit, miss, cancelled or superseded."""
+        self.counts[outcome] += 1
+        pipeline_metrics.speculations.inc(outcome=outcome)
+        if saved_secs is not None:
+            self.saved_secs_total += saved_secs
+            pipeline_metrics.speculation_saved.observe(saved_secs)
+
+    def snapshot(self) -> Dict:
+        hits = self.counts["hit"]
+        # Superseded speculations were replaced by one on a newer transcript: not a turn outcome
+        decided = hits + self.counts["miss"] + self.counts["cancelled"]
+        return {
+            "enabled": self.enabled,
+            "min_similarity": self.min_similarity,
+            "hit_rate": round(hits / decided, 3) if decided else None,
+            "miss_rate": round(self.counts["miss"] / decided, 3) if decided else None,
+            "saved_ms_total": round(self.saved_secs_total * 1000),
+            "saved_ms_avg": round(self.saved_secs_total * 1000 / hits) if hits else None,
+            "started": self.started,
+            "failed": self.failed,
+            **self.counts,
+        }
+
+
+@dataclass
+class Speculation:
+    params: Dict  # Invocation params, messages ending with the speculated user turn
+    user_text: str
+    started: float = field(default_factory=time.monotonic)
+    first_chunk_at: Optional[float] = None
+    error: Optional[Exception] = None
+    task: Optional[asyncio.Task] = None
+    # Streamed chunks, then None at the end (or the exception it failed with)
+    chunks: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+
+class SpeculativeAzureLLMService(WarmAzureLLMService):
+    """Azure LLM that can start a turn's reply before the turn is final."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._speculation: Optional[Speculation] = None
+        self._committed: Optional[Speculation] = None  # Claimed and being replayed as the reply
+
+    async def speculate(self, context: LLMContext, user_text: str):
+        """Start generating the reply to `context` plus this user text, in the background."""
+        if self._speculation and self._speculation.user_text == user_text:
+            return
+        await self.cancel_speculation("superseded")
+
+        speculative_context = LLMContext(
+            messages=context.get_messages() + [{"role": "user", "content": user_text}],
+            tools=context.tools,
+            tool_choice=context.tool_choice,
+        )
+        params = self.get_llm_adapter().get_llm_invocation_params(speculative_context)
+        speculation = Speculation(params=params, user_text=user_text)
+        speculation.task = self.create_task(self._run_speculation(speculation))
+        self._speculation = speculation
+        speculation_stats.started += 1
+        logger.debug(f"🔮 Speculating on: {user_text!r}")
+
+    async def cancel_speculation(self, outcome: Optional[str] = "cancelled"):
+        speculation, self._speculation = self._speculation, None
+        if speculation is None:
+            return
+        if not speculation.task.done():
+            await self.cancel_task(speculation.task)
+        if outcome:
+            speculation_stats.record(outcome)
+
+    async def _run_speculation(self, speculation: Speculation):
+        try:
+            stream = await self.get_chat_completions(speculation.params)
+            try:
+                async for chunk in stream:
+                    if speculation.first_chunk_at is None and chunk.choices:
+                        speculation.first_chunk_at = time.monotonic()
+                    speculation.chunks.put_nowait(chunk)
+            finally:
+                await stream.close()
+            speculation.chunks.put_nowait(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            speculation.error = e
+            speculation.chunks.put_nowait(e)
+
+    async def _claim_speculation(self, params) -> Optional[Speculation]:
+        """The pending speculation if it answers the same turn, counting the outcome."""
+        speculation, self._speculation = self._speculation, None
+        if speculation is None:
+            return None
+        if speculation.error is not None:
+            speculation_stats.failed += 1
+            speculation_stats.record("miss")
+            return None
+
+        messages, speculated = params["messages"], speculation.params["messages"]
+        final_text = str(messages[-1].get("content", "")) if messages else ""
+        matches = (
+            len(messages) == len(speculated)
+            and messages[:-1] == speculated[:-1]
+            and messages[-1].get("role") == "user"
+            and params.get("tools") == speculation.params.get("tools")
+            and transcript_similarity(final_text, speculation.user_text)
+            >= speculation_stats.min_similarity
+        )
+        if not matches:
+            if not speculation.task.done():
+                await self.cancel_task(speculation.task)
+            speculation_stats.record("miss")
+            logger.debug(f"🔮 Speculation missed: {speculation.user_text!r} vs {final_text!r}")
+            return None
+
+        # The reply would have started now; it started at `started` and may have streamed already
+        now = time.monotonic()
+        saved = now - speculation.started
+        if speculation.first_chunk_at is not None:
+            saved = min(saved, speculation.first_chunk_at - speculation.started)
+        speculation_stats.record("hit", saved_secs=saved)
+        logger.debug(f"🔮 Speculation hit, {saved * 1000:.0f}ms ahead")
+        self._committed = speculation
+        return speculation
+
+    async def _stop_committed(self):
+        """Stop the completion behind the reply being replayed (barge-in or shutdown)."""
+        speculation, self._committed = self._committed, None
+        if speculation is None:
+            return
+        if not speculation.task.done():
+            await self.cancel_task(speculation.task)
+        # Wake a replay still waiting for chunks
+        speculation.chunks.put_nowait(None)
+
+    async def _replay(self, speculation: Speculation) -> AsyncGenerator:
+        try:
+            while True:
+                chunk = await speculation.chunks.get()
+                if chunk is None:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            if self._committed is speculation:
+                self._committed = None
+            if not speculation.task.done():
+                await self.cancel_task(speculation.task)
+
+    async def _stream_chat_completions_universal_context(self, context: LLMContext):
+        params = self.get_llm_adapter().get_llm_invocation_params(context)
+        speculation = await self._claim_speculation(params)
+        if speculation is None:
+            return await super()._stream_chat_completions_universal_context(context)
+        return self._replay(speculation)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        if isinstance(frame, InterruptionFrame):
+            await self.cancel_speculation()
+            await self._stop_committed()
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            await self.cancel_speculation(outcome=None)
+            await self._stop_committed()
+        await super().process_frame(frame, direction)
+
+
+class SpeculationTrigger(FrameProcessor):
+    """Starts speculative replies while the end-of-turn decision is pending (before the
+    user aggregator)."""
+
+    def __init__(self, llm: SpeculativeAzureLLMService, context: LLMContext):
+        super().__init__()
+        self._llm = llm
+        self._context = context
+        self._finals: List[str] = []
+        self._interim = ""
+        self._pending = False  # VAD heard a pause; smart-turn has not ended the turn yet
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, UserStartedSpeakingFrame):
+            self._finals, self._interim = [], ""
+        elif isinstance(frame, VADUserStartedSpeakingFrame):
+            # The candidate kept talking or barged in: whatever we guessed is stale
+            self._pending = False
+            await self._llm.cancel_speculation()
+        elif isinstance(frame, VADUserStoppedSpeakingFrame):
+            self._pending = True
+            await self._speculate()
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            self._pending = False
+        elif isinstance(frame, TranscriptionFrame) and frame.text.strip():
+            self._finals.append(frame.text.strip())
+            self._interim = ""
+            await self._speculate()
+        elif isinstance(frame, InterimTranscriptionFrame):
+            self._interim = frame.text.strip()
+            await self._speculate()
+
+        await self.push_frame(frame, direction)
+
+    async def _speculate(self):
+        text = " ".join(self._finals + [self._interim]).strip()
+        if self._pending and text:
+            await self._llm.speculate(self._context, text)
+
+
+# Process-wide stats
+speculation_stats = SpeculationStats()
@@ -0,0 +1,157 @@
+"""
+In-memory cache of the frontend files, precompressed.
+
+The frontend is a handful of files that never change while the server runs,
+so they are read once at startup and kept in memory with gzip (and brotli,
+when the `brotli` package is installed) variants and a strong ETag. Requests
+are answered from memory: the best encoding the client accepts, or a 304
+when its copy is current. With `STATIC_DEV_RELOAD=true` each request checks
+the file on disk and reloads it when it changed, for editing the frontend
+without restarting.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from loguru import logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Worth compressing: text formats (images etc. are compressed already)
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS_BYTES = 512
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    media_type: str
+    etag: str  # Without quotes; each encoding appends its own suffix
+    stamp: Tuple[float, int]  # (mtime, size) of the file it was read from
+    variants: Dict[str, bytes]  # Content-Encoding ("identity", "br", "gzip") -> body
+
+    @classmethod
+    def load(cls, path: Path) -> "StaticAsset":
+        stat = path.stat()
+        body = path.read_bytes()
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+
+        variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES and media_type.startswith(COMPRESSIBLE_TYPES):
+            if brotli is not None:
+                variants["br"] = brotli.compress(body, quality=11)
+            variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            # Keep only encodings that actually save bytes
+            variants = {
+                encoding: data
+                for encoding, data in variants.items()
+                if encoding == "identity" or len(data) < len(body)
+            }
+        return cls(
+            media_type=media_type,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            stamp=(stat.st_mtime, stat.st_size),
+            variants=variants,
+        )
+
+    def tag(self, encoding: str) -> str:
+        # Strong ETags must differ per representation
+        return f'"{self.etag}"' if encoding == "identity" else f'"{self.etag}-{encoding}"'
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+class StaticCache:
+    """The frontend directory, loaded into memory once."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.dev_reload = os.getenv("STATIC_DEV_RELOAD", "false").lower() == "true"
+        self._assets: Dict[str, StaticAsset] = {}
+
+    def load(self):
+        if not self.directory.exists():
+            return
+        assets = {}
+        for path in sorted(self.directory.rglob("*")):
+            if path.is_file() and not path.name.startswith("."):
+                assets[path.relative_to(self.directory).as_posix()] = StaticAsset.load(path)
+        self._assets = assets
+        total = sum(len(a.variants["identity"]) for a in assets.values())
+        logger.info(
+            f"📦 Cached {len(assets)} frontend files ({total / 1024:.0f} KB, "
+            f"encodings: {'br, ' if brotli else ''}gzip)"
+        )
+
+    def get(self, name: str) -> Optional[StaticAsset]:
+        if self.dev_reload:
+            return self._reload(name)
+        return self._assets.get(name)
+
+    def _reload(self, name: str) -> Optional[StaticAsset]:
+        path = (self.directory / name).resolve()
+        if not path.is_relative_to(self.directory.resolve()) or not path.is_file():
+            self._assets.pop(name, None)
+            return None
+        stat = path.stat()
+        asset = self._assets.get(name)
+        if asset is None or asset.stamp != (stat.st_mtime, stat.st_size):
+            asset = self._assets[name] = StaticAsset.load(path)
+            logger.debug(f"📦 Reloaded {name}")
+        return asset
+
+    def response(self, request: Request, name: str) -> Optional[Response]:
+        """The cached file as a response for this request, or None if there is no such file."""
+        asset = self.get(name)
+        if asset is None:
+            return None
+
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next(
+            (e for e in ("br", "gzip") if e in asset.variants and accepted.get(e, 0) > 0),
+            "identity",
+        )
+        headers = {
+            "ETag": asset.tag(encoding),
+            # Revalidate every time; an unchanged file costs a 304 with no body
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # Any encoding of the same content is still current
+            current = {asset.tag(e) for e in asset.variants}
+            tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+            if "*" in tags or tags & current:
+                return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=asset.variants[encoding], media_type=asset.media_type, headers=headers
+        )
@@ -0,0 +1,382 @@
+"""
+Multi-process mode: a front HTTP process in front of N bot worker processes.
+
+Each worker is a normal single-process server (server.py on a loopback port)
+with its own event loop, models and admission controller, so sessions spread
+across cores. The front process:
+
+- stores interview setups itself and inlines them into offers, since a
+  session token may be redeemed on any worker, and passes each setup to the
+  least-loaded worker so it can prefetch the greeting
+- sends each new offer to the least-loaded ready worker, falling back to the
+  next one if a worker refuses with 503
+- remembers which worker owns each pc_id and routes ICE PATCHes there
+- proxies everything else (frontend files, etc.) to a worker
+
+Enabled by running server.py with WORKERS > 1.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from loguru import logger
+
+from metrics import merge_expositions
+from sessions import setup_store
+
+WORKERS = int(os.getenv("WORKERS", 1))
+WORKER_BASE_PORT = int(os.getenv("WORKER_BASE_PORT", 7900))
+WORKER_POLL_SECS = float(os.getenv("WORKER_POLL_SECS", 1))
+WORKER_RESTART_DELAY_SECS = 2
+
+# Hop-by-hop headers that must not be copied through the proxy
+HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length", "host"}
+
+
+@dataclass
+class Worker:
+    index: int
+    port: int
+    process: Optional[subprocess.Popen] = None
+    ready: bool = False
+    load: float = 0  # active + queued sessions from the last poll, plus offers sent since
+    pc_ids: set = field(default_factory=set)
+    assigned: int = 0  # Offers routed here so far; lets a poll count those it could not see
+    restarts: int = 0
+    restart_at: Optional[float] = None  # Set while an exited worker waits to be restarted
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        # The port goes on the command line: server.py loads .env with override=True,
+        # which would replace a PORT or WORKERS passed in the environment
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                str(Path(__file__).parent / "server.py"),
+                "--worker-port",
+                str(self.port),
+            ]
+        )
+        self.ready = False
+        self.restart_at = None
+        logger.info(f"👷 Worker {self.index} started on port {self.port} (pid {self.process.pid})")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class WorkerPool:
+    """Starts the workers, tracks their load and owns the pc_id -> worker map."""
+
+    def __init__(self, count: int, base_port: int):
+        self.workers = [Worker(index=i, port=base_port + i) for i in range(count)]
+        self.routes: Dict[str, Worker] = {}
+        self.http: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        # Relay bodies as-is (compressed responses keep their Content-Encoding)
+        self.http = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=60), auto_decompress=False
+        )
+        for worker in self.workers:
+            worker.start()
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.stop()
+        if self.http:
+            await self.http.close()
+
+    def by_load(self) -> List[Worker]:
+        """Ready workers, least loaded first."""
+        return sorted(
+            (w for w in self.workers if w.ready), key=lambda w: (w.load, len(w.pc_ids), w.index)
+        )
+
+    def assign(self, pc_id: str, worker: Worker):
+        self.routes[pc_id] = worker
+        worker.pc_ids.add(pc_id)
+        worker.assigned += 1
+        worker.load += 1
+
+    async def poll(self):
+        """Refresh readiness, load and live pc_ids; restart workers that died."""
+        while True:
+            for worker in self.workers:
+                if worker.process and worker.process.poll() is not None:
+                    # Restart after a delay without holding up polling of the other workers
+                    if worker.restart_at is None:
+                        logger.error(
+                            f"❌ Worker {worker.index} exited ({worker.process.returncode}), "
+                            "restarting"
+                        )
+                        worker.ready = False
+                        self._forget(worker, set(worker.pc_ids))
+                        worker.restarts += 1
+                        worker.restart_at = time.monotonic() + WORKER_RESTART_DELAY_SECS
+                    elif time.monotonic() >= worker.restart_at:
+                        worker.start()
+                    continue
+                await self._poll_worker(worker)
+            await asyncio.sleep(WORKER_POLL_SECS)
+
+    async def _poll_worker(self, worker: Worker):
+        # Offers assigned while the request is in flight are missing from its response
+        known = set(worker.pc_ids)
+        assigned = worker.assigned
+        try:
+            async with self.http.get(f"{worker.url}/readyz") as resp:
+                worker.ready = resp.status == 200
+            async with self.http.get(f"{worker.url}/api/sessions") as resp:
+                sessions = await resp.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            worker.ready = False
+            return
+
+        admission = sessions.get("admission", {})
+        in_flight = worker.assigned - assigned
+        worker.load = admission.get("active", 0) + admission.get("queued", 0) + in_flight
+        live = {s["pc_id"] for s in sessions.get("sessions", [])}
+        self._forget(worker, known - live)
+
+    def _forget(self, worker: Worker, pc_ids: set):
+        for pc_id in pc_ids:
+            worker.pc_ids.discard(pc_id)
+            if self.routes.get(pc_id) is worker:
+                del self.routes[pc_id]
+
+    def snapshot(self) -> Dict:
+        return {
+            "workers": [
+                {
+                    "index": w.index,
+                    "port": w.port,
+                    "pid": w.process.pid if w.process else None,
+                    "ready": w.ready,
+                    "load": w.load,
+                    "sessions": len(w.pc_ids),
+                    "restarts": w.restarts,
+                }
+                for w in self.workers
+            ],
+            "routes": len(self.routes),
+        }
+
+
+pool = WorkerPool(WORKERS, WORKER_BASE_PORT)
+prefetch_tasks: set = set()  # Greeting prefetch hints in flight
+
+
+async def forward(worker: Worker, request: Request, body: bytes = None) -> Response:
+    """Proxy a request to a worker and relay its response."""
+    headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_HEADERS}
+    url = f"{worker.url}{request.url.path}"
+    if request.url.query:
+        url += f"?{request.url.query}"
+    async with pool.http.request(
+        request.method,
+        url,
+        headers=headers,
+        data=body if body is not None else await request.body(),
+    ) as resp:
+        content = await resp.read()
+        resp_headers = {k: v for k, v in resp.headers.items() if k.lower() not in HOP_HEADERS}
+        return Response(content=content, status_code=resp.status, headers=resp_headers)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await pool.start()
+    poll_task = asyncio.create_task(pool.poll())
+    yield
+    poll_task.cancel()
+    await pool.stop()
+
+
+app = FastAPI(title="AI Interview Coach (supervisor)", lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Ready once at least one worker is."""
+    ready = sum(w.ready for w in pool.workers)
+    return JSONResponse(
+        {"status": "ready" if ready else "warming_up", "ready_workers": ready},
+        status_code=200 if ready else 503,
+    )
+
+
+@app.post("/api/setup")
+async def receive_setup(request: Request):
+    """Keep setups in the front process so a token works whichever worker gets the offer."""
+    data = await request.json()
+    session_token = setup_store.put(data)
+    logger.info(f"📋 Received interview setup: {data}")
+    candidates = pool.by_load()
+    if candidates:
+        # The offer will most likely go to the least-loaded worker: let it prefetch the greeting
+        task = asyncio.create_task(prefetch_greeting(candidates[0], data))
+        prefetch_tasks.add(task)
+        task.add_done_callback(prefetch_tasks.discard)
+    return {"status": "ok", "received": data, "session_token": session_token}
+
+
+async def prefetch_greeting(worker: Worker, data: Dict):
+    """Post the setup to a worker, which starts on the greeting (its token is not used)."""
+    try:
+        async with pool.http.post(f"{worker.url}/api/setup", json=data) as resp:
+            await resp.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.debug(f"Worker {worker.index} missed the greeting prefetch: {e}")
+
+
+@app.get("/api/setup")
+async def get_setup(session_token: str = None):
+    return {"setup": setup_store.get(session_token)}
+
+
+@app.get("/api/sessions")
+async def list_sessions():
+    """Per-worker session views plus the front process' routing state."""
+    workers = []
+    for worker in pool.workers:
+        try:
+            async with pool.http.get(f"{worker.url}/api/sessions") as resp:
+                workers.append({"index": worker.index, **(await resp.json())})
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            workers.append({"index": worker.index, "error": str(e)})
+    return {
+        "open": sum(w.get("open", 0) for w in workers),
+        "supervisor": pool.snapshot(),
+        "workers": workers,
+    }
+
+
+@app.get("/api/sessions/{pc_id}/timeline")
+async def session_timeline(pc_id: str, request: Request):
+    """Only the worker that owns the pc_id has its timeline."""
+    worker = pool.routes.get(pc_id)
+    if worker is None:
+        return JSONResponse({"error": "Connection not found"}, status_code=404)
+    return await forward(worker, request)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Every worker's Prometheus metrics, labelled with the worker index."""
+    texts = {}
+    for worker in pool.workers:
+        try:
+            async with pool.http.get(f"{worker.url}/metrics") as resp:
+                if resp.status == 200:
+                    texts[str(worker.index)] = await resp.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            continue
+    return PlainTextResponse(
+        merge_expositions(texts, "worker"), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.post("/api/offer")
+async def handle_offer(request: Request):
+    """Send the offer to the least-loaded worker that will take it."""
+    data = await request.json()
+    if not data.get("request_data"):
+        data["request_data"] = setup_store.get(data.get("session_token"))
+
+    candidates = pool.by_load()
+    if not candidates:
+        return JSONResponse(
+            {"detail": "Server is warming up, please retry shortly"},
+            status_code=503,
+            headers={"Retry-After": "5"},
+        )
+
+    busy: Optional[Response] = None
+    start = time.monotonic()
+    for worker in candidates:
+        try:
+            async with pool.http.post(f"{worker.url}/api/offer", json=data) as resp:
+                if resp.status == 503:
+                    # Worker is full or still warming up; try the next one
+                    busy = Response(
+                        content=await resp.read(),
+                        status_code=503,
+                        headers={"Retry-After": resp.headers.get("Retry-After", "5")},
+                        media_type="application/json",
+                    )
+                    continue
+                answer = await resp.json()
+                if resp.status != 200:
+                    return JSONResponse(answer, status_code=resp.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Worker {worker.index} failed the offer: {e}")
+            continue
+
+        pool.assign(answer["pc_id"], worker)
+        logger.info(
+            f"📤 Offer {answer['pc_id']} -> worker {worker.index} "
+            f"in {(time.monotonic() - start) * 1000:.0f}ms"
+        )
+        return answer
+
+    return busy or JSONResponse({"detail": "No worker available"}, status_code=503)
+
+
+@app.patch("/api/offer")
+async def handle_ice_candidate(request: Request):
+    """Route ICE candidates to the worker that owns the pc_id."""
+    body = await request.body()
+    try:
+        pc_id = (await request.json()).get("pc_id")
+    except ValueError:
+        pc_id = None
+    worker = pool.routes.get(pc_id)
+    if worker is None:
+        return JSONResponse({"error": "Connection not found"}, status_code=404)
+    return await forward(worker, request, body)
+
+
+@app.api_route("/{path:path}", methods=["GET", "HEAD"])
+async def proxy(path: str, request: Request):
+    """Frontend files and debug routes are the same on every worker."""
+    for worker in pool.workers:
+        if not (worker.process and worker.process.poll() is None):
+            continue
+        try:
+            return await forward(worker, request)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            continue  # Not listening yet (just started or restarting)
+    return JSONResponse({"error": "No worker available"}, status_code=503)
@@ -0,0 +1,214 @@
+"""
+Live transcript helpers: a streaming sentence segmenter and a coalescing
+data-channel sender.
+
+The LLM streams its reply a token at a time. `SentenceSegmenter` collects the
+tokens in a list and emits whole sentences, without splitting on abbreviations
+("Dr. Smith", "J. Smith"), decimals ("3.5") or list numbers ("1. First"). `TranscriptSender`
+queues bot sentences and user STT captions and sends them over the data
+channel at most once per flush interval, so a burst of tokens costs one
+message and one JSON encode instead of one per sentence.
+"""
+
+import asyncio
+import re
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+# Terminal punctuation (plus closing quotes/brackets) followed by whitespace, or a line break
+SENTENCE_BOUNDARY = re.compile(r"([.!?…]+[\"'”’)\]]*)\s+|\n+")
+TRAILING_PUNCTUATION = re.compile(r"[.!?…\"'”’)\]]*$")
+LAST_WORD = re.compile(r"(\S+)$")
+DOTTED_ACRONYM = re.compile(r"(?:[a-z]\.)+[a-z]")
+
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "vs", "etc", "inc", "ltd", "corp", "dept",
+    "approx", "fig",
+}  # fmt: skip
+# Also ordinary words ("No. I mean it."): abbreviations only before a number ("No. 5", "Jan. 3")
+NUMBER_ABBREVIATIONS = {
+    "no", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+}  # fmt: skip
+
+
+# Capitalised words that usually open a sentence rather than follow an initial ("Plan A. Then")
+SENTENCE_STARTERS = {
+    "a", "after", "also", "and", "anyway", "as", "at", "because", "before", "but", "finally",
+    "first", "for", "he", "her", "his", "how", "however", "i", "if", "in", "it", "my", "next",
+    "no", "now", "of", "on", "our", "she", "so", "that", "the", "then", "there", "they", "this",
+    "to", "we", "well", "what", "when", "which", "who", "why", "yes", "you",
+}  # fmt: skip
+NEXT_TOKEN = re.compile(r"\S+(?=\s)")
+INITIAL = re.compile(r"[(\"'“‘]*[A-Z]\.")
+
+
+def _is_abbreviation(word: str) -> bool:
+    word = word.lstrip("(\"'“‘").lower()
+    return word in ABBREVIATIONS or DOTTED_ACRONYM.fullmatch(word) is not None  # "e.g.", "U.S."
+
+
+def _depends_on_next(word: str) -> bool:
+    """Whether "word." ends a sentence depends on what follows: "No. 5", "J. Smith"."""
+    word = word.lstrip("(\"'“‘")
+    return word.lower() in NUMBER_ABBREVIATIONS or (
+        len(word) == 1 and word.isupper() and word != "I"
+    )
+
+
+def _continues(word: str, after: str) -> Optional[bool]:
+    """Whether the text after "word." continues the sentence; None until it is known."""
+    word = word.lstrip("(\"'“‘")
+    if word.lower() in NUMBER_ABBREVIATIONS:
+        return after[:1].isdigit() if after else None  # "No. 5", "Jan. 3"
+    # A capital initial: followed by another initial or a surname ("J. K. Rowling")
+    token = NEXT_TOKEN.match(after)
+    if token is None:
+        return None
+    name = token.group().strip("(\"'“‘.,;:!?…”’)]")
+    return INITIAL.fullmatch(token.group()) is not None or (
+        name[:1].isupper() and name.lower() not in SENTENCE_STARTERS
+    )
+
+
+def _is_list_number(before: str, word: re.Match) -> bool:
+    """A number opening a sentence or following a colon: "1." in "Steps: 1. Plan"."""
+    lead = before[: word.start()].rstrip()
+    return word.group(1).isdigit() and (not lead or lead.endswith((":", ";")))
+
+
+class SentenceSegmenter:
+    """Turns a stream of text fragments into complete sentences."""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        # Offset into the joined buffer where unscanned text starts
+        self._scan_from = 0
+
+    def push(self, text: str) -> List[str]:
+        """Add a fragment; return any sentences it completed."""
+        self._parts.append(text)
+        # A boundary needs whitespace after the punctuation, so most tokens need no scan
+        if not any(c.isspace() for c in text):
+            return []
+
+        buffer = "".join(self._parts)
+        sentences = []
+        start = 0
+        deferred_at = None
+        for match in SENTENCE_BOUNDARY.finditer(buffer, self._scan_from):
+            punctuation = match.group(1)
+            if punctuation and punctuation.startswith(".") and len(punctuation) == 1:
+                before = buffer[start : match.start()].strip()
+                word = LAST_WORD.search(before)
+                if word and (_is_abbreviation(word.group(1)) or _is_list_number(before, word)):
+                    continue  # "Dr. Smith", "e.g. this", "Steps: 1. Plan"
+                if word and _depends_on_next(word.group(1)):
+                    continues = _continues(word.group(1), buffer[match.end() :])
+                    if continues is None:
+                        deferred_at = match.start()  # Decide once the next word arrives
+                        break
+                    if continues:
+                        continue  # "No. 5", "J. Smith"
+            sentence = buffer[start : match.end(1) if punctuation else match.start()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+
+        rest = buffer[start:]
+        self._parts = [rest] if rest else []
+        # Only the trailing punctuation run (or a deferred boundary) can still become one
+        if deferred_at is not None:
+            self._scan_from = deferred_at - start
+        else:
+            self._scan_from = TRAILING_PUNCTUATION.search(rest).start()
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is buffered (end of the response) and reset."""
+        text = "".join(self._parts).strip()
+        self.clear()
+        return text or None
+
+    def clear(self):
+        self._parts = []
+        self._scan_from = 0
+
+
+class TranscriptSender:
+    """Coalesces transcript messages into one data-channel send per flush interval."""
+
+    def __init__(self, send: Callable[[Dict], None], flush_interval_secs: float = 0.15):
+        self._send = send
+        self.flush_interval_secs = flush_interval_secs
+        self._bot_sentences: List[str] = []
+        self._user_final: List[str] = []
+        self._user_interim: Optional[str] = None
+        self._order: List[str] = []  # Which kinds arrived first, to keep captions in order
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def add_bot_sentence(self, sentence: str):
+        self._bot_sentences.append(sentence)
+        self._queued("bot")
+
+    def add_user_transcript(self, text: str, final: bool):
+        if final:
+            self._user_final.append(text)
+            self._user_interim = None  # Superseded by the final text
+        else:
+            self._user_interim = text  # Only the latest interim matters
+        self._queued("user")
+
+    def _queued(self, kind: str):
+        if kind not in self._order:
+            self._order.append(kind)
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.flush_interval_secs, self.flush)
+
+    def _messages(self) -> List[Dict]:
+        messages = []
+        for kind in self._order:
+            if kind == "bot" and self._bot_sentences:
+                text = " ".join(self._bot_sentences)
+                messages.append({"type": "bot-transcription", "data": text})
+            elif kind == "user":
+                if self._user_final:
+                    messages.append(
+                        {
+                            "type": "user-transcription",
+                            "data": {"text": " ".join(self._user_final), "final": True},
+                        }
+                    )
+                if self._user_interim:
+                    messages.append(
+                        {
+                            "type": "user-transcription",
+                            "data": {"text": self._user_interim, "final": False},
+                        }
+                    )
+        return messages
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        messages = self._messages()
+        self._bot_sentences, self._user_final, self._user_interim = [], [], None
+        self._order = []
+        if not messages:
+            return
+
+        if len(messages) == 1:
+            payload = messages[0]
+        else:
+            payload = {"type": "transcript-batch", "messages": messages}
+        try:
+            # send_app_message JSON-encodes the payload itself
+            self._send(payload)
+        except Exception as e:
+            logger.warning(f"Could not send transcript: {e}")
+
+    def close(self):
+        """Send anything still queued and stop the timer."""
+        self.flush()
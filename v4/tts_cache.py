@@ -0,0 +1,277 @@
+"""
+Persistent cache of synthesized interviewer speech.
+
+Greetings, acknowledgements ("Thank you for sharing that.") and closing lines
+repeat across sessions, yet each one used to be synthesized by Cartesia again.
+`TTSCache` keeps raw PCM per (voice, model, settings, sample rate, text) on
+disk with an LRU size cap. Hits are read through mmap and the store is shared
+by every session and worker process on the host. `CachedCartesiaTTSService`
+replays hits straight into the pipeline and records short phrases that
+repeat as Cartesia streams them back; everything else stays on Cartesia's
+continued context.
+"""
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import re
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+from loguru import logger
+from pipecat.frames.frames import (
+    Frame,
+    InterruptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.services.cartesia.tts import CartesiaTTSService
+
+# Replayed audio is pushed in chunks of this length, like a streamed response
+REPLAY_CHUNK_SECS = 0.2
+# How many uncached sentences' sighting counts are remembered
+MAX_TRACKED_SENTENCES = 10000
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class TTSCache:
+    """On-disk LRU store of PCM clips, bounded by total size."""
+
+    def __init__(self):
+        self.enabled = os.getenv("TTS_CACHE", "true").lower() == "true"
+        self.directory = Path(os.getenv("TTS_CACHE_DIR", Path(__file__).parent / ".tts_cache"))
+        self.max_bytes = int(float(os.getenv("TTS_CACHE_MAX_MB", 200)) * 2**20)
+        # Short phrases only: caching breaks Cartesia's continuation (prosody) across sentences
+        self.max_chars = int(os.getenv("TTS_CACHE_MAX_CHARS", 80))
+        # Record a phrase once it has been synthesized this many times, so one-off sentences
+        # stay on the continued context and never get a file
+        self.min_repeats = int(os.getenv("TTS_CACHE_MIN_REPEATS", 2))
+        self._sightings: "OrderedDict[str, int]" = OrderedDict()  # key -> times synthesized
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._total_bytes = 0
+        self._loaded = False
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "bytes_saved": 0}
+
+    @staticmethod
+    def key(voice_id: str, model: str, settings: Dict, sample_rate: int, text: str) -> str:
+        material = json.dumps(
+            [voice_id, model, settings, sample_rate, normalize_text(text)],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        return self.enabled and 0 < len(normalize_text(text)) <= self.max_chars
+
+    def worth_recording(self, key: str) -> bool:
+        """Count a synthesis of this uncached phrase; True once it is a repeat."""
+        count = self._sightings.pop(key, 0) + 1
+        if count >= self.min_repeats:
+            return True
+        self._sightings[key] = count
+        if len(self._sightings) > MAX_TRACKED_SENTENCES:
+            self._sightings.popitem(last=False)
+        return False
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pcm"
+
+    def _load_index(self):
+        """Rebuild the LRU order from file modification times (blocking)."""
+        if self._loaded:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.directory.glob("*.pcm"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._loaded = True
+        logger.info(f"🔊 TTS cache: {len(self._index)} clips, {self._total_bytes / 2**20:.1f} MB")
+
+    def _read(self, key: str) -> Optional[bytes]:
+        self._load_index()
+        if key not in self._index:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                audio = mm[:]
+            os.utime(path)  # Persist recency for the next process that rebuilds the index
+        except (OSError, ValueError):
+            # Evicted by another worker sharing the directory, or truncated
+            self._forget(key)
+            return None
+        self._index.move_to_end(key)
+        return audio
+
+    def _write(self, key: str, audio: bytes):
+        self._load_index()
+        tmp = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        tmp.write_bytes(audio)
+        os.replace(tmp, self._path(key))  # Atomic, so readers never see a partial clip
+        if key in self._index:
+            self._total_bytes -= self._index[key]
+        self._index[key] = len(audio)
+        self._index.move_to_end(key)
+        self._total_bytes += len(audio)
+        self.stats["stores"] += 1
+
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            try:
+                self._path(oldest).unlink()
+            except OSError:
+                pass
+            self._forget(oldest)
+            self.stats["evictions"] += 1
+
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    async def get(self, key: str) -> Optional[bytes]:
+        audio = await asyncio.to_thread(self._read, key)
+        if audio is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+            self.stats["bytes_saved"] += len(audio)
+        return audio
+
+    async def put(self, key: str, audio: bytes):
+        try:
+            await asyncio.to_thread(self._write, key, audio)
+        except OSError as e:
+            logger.warning(f"Could not store TTS clip: {e}")
+
+    def snapshot(self) -> Dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "clips": len(self._index),
+            "size_mb": round(self._total_bytes / 2**20, 1),
+            "max_mb": round(self.max_bytes / 2**20, 1),
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+            **self.stats,
+        }
+
+
+class CachedCartesiaTTSService(CartesiaTTSService):
+    """
+    CartesiaTTSService that replays cached sentences and records new ones.
+
+    Each cacheable sentence gets its own Cartesia context so its audio can be
+    captured on its own; hits are pushed through an audio context of their own
+    so they play in order with streamed audio.
+    """
+
+    def __init__(self, *, cache: "TTSCache", **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache
+        self._pending_key: Optional[str] = None
+        self._recordings: Dict[str, Tuple[str, List[bytes]]] = {}  # context id -> (key, chunks)
+
+    def _cache_key(self, text: str) -> str:
+        return TTSCache.key(self._voice_id, self.model_name, self._settings, self.sample_rate, text)
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        if not self._cache.cacheable(text):
+            async for frame in super().run_tts(text):
+                yield frame
+            return
+
+        key = self._cache_key(text)
+        audio = await self._cache.get(key)
+        if audio is None and not self._cache.worth_recording(key):
+            # Not a known repeat: keep it on the continued context
+            async for frame in super().run_tts(text):
+                yield frame
+            return
+
+        # Close any open (continued) Cartesia context so this sentence stands alone
+        await self.flush_audio()
+
+        if audio is not None:
+            logger.debug(f"{self}: TTS cache hit [{text}]")
+            async for frame in self._replay(text, audio):
+                yield frame
+            return
+
+        self._pending_key = key
+        try:
+            async for frame in super().run_tts(text):
+                yield frame
+        finally:
+            self._pending_key = None
+        await self.flush_audio()
+
+    async def _replay(self, text: str, audio: bytes) -> AsyncGenerator[Frame, None]:
+        context_id = str(uuid.uuid4())
+        yield TTSStartedFrame()
+        await self.create_audio_context(context_id)
+        await self.start_word_timestamps()
+
+        chunk_bytes = int(self.sample_rate * REPLAY_CHUNK_SECS) * 2  # 16-bit mono
+        for offset in range(0, len(audio), chunk_bytes):
+            frame = TTSAudioRawFrame(
+                audio=audio[offset : offset + chunk_bytes],
+                sample_rate=self.sample_rate,
+                num_channels=1,
+            )
+            await self.append_to_audio_context(context_id, frame)
+
+        # No word timings are stored; spread the words evenly over the clip for captions
+        words = normalize_text(text).split(" ")
+        duration = len(audio) / 2 / self.sample_rate
+        await self.add_word_timestamps(
+            [(word, i * duration / len(words)) for i, word in enumerate(words)]
+            + [("TTSStoppedFrame", 0), ("Reset", 0)]
+        )
+        await self.remove_audio_context(context_id)
+        yield None
+
+    async def create_audio_context(self, context_id: str):
+        await super().create_audio_context(context_id)
+        if self._pending_key is not None:
+            self._recordings[context_id] = (self._pending_key, [])
+            self._pending_key = None
+
+    async def append_to_audio_context(self, context_id: str, frame: TTSAudioRawFrame):
+        recording = self._recordings.get(context_id)
+        if recording is not None:
+            recording[1].append(frame.audio)
+        await super().append_to_audio_context(context_id, frame)
+
+    async def remove_audio_context(self, context_id: str):
+        # Cartesia reported the context done: the recording is complete
+        recording = self._recordings.pop(context_id, None)
+        if recording is not None and recording[1]:
+            key, chunks = recording
+            self.create_task(self._cache.put(key, b"".join(chunks)))
+        await super().remove_audio_context(context_id)
+
+    async def _handle_interruption(self, frame: InterruptionFrame, direction: FrameDirection):
+        # Interrupted audio is incomplete; never cache it
+        self._recordings.clear()
+        self._pending_key = None
+        await super()._handle_interruption(frame, direction)
+
+
+# Process-wide cache (the directory is shared with other workers)
+tts_cache = TTSCache()
@@ -0,0 +1,120 @@
+"""
+Per-turn voice-to-voice latency tracing.
+
+A turn starts when VAD hears the candidate stop speaking and ends when the
+first audio of the bot's reply leaves the transport. In between, the
+`TurnTracingObserver` in bot.py marks each stage on the pipeline clock:
+
+    vad_stop            VAD detected silence (offset 0)
+    turn_end            smart-turn decided the turn is complete
+    stt_final           last final transcript before the LLM replied (may be < 0)
+    llm_first_token     first LLM text of the reply
+    tts_first_audio     first synthesized audio
+    avatar_first_audio  first lip-synced audio back from Simli
+    avatar_first_video  first Simli video frame after that
+    bot_audio_out       first reply audio sent to the client
+
+Each session keeps its last `TIMELINE_MAX_TURNS` turns (offsets in ms from
+`vad_stop`) with percentiles per stage, so a regression shows which stage
+moved. Every finished turn is also fed to the `/metrics` histograms.
+"""
+
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from metrics import pipeline_metrics
+
+STAGES = (
+    "vad_stop",
+    "turn_end",
+    "stt_final",
+    "llm_first_token",
+    "tts_first_audio",
+    "avatar_first_audio",
+    "avatar_first_video",
+    "bot_audio_out",
+)
+
+TIMELINE_MAX_TURNS = int(os.getenv("TIMELINE_MAX_TURNS", 50))
+
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))], 1)
+
+
+class TurnTimeline:
+    """Ring buffer of one session's traced turns."""
+
+    def __init__(self, max_turns: int = TIMELINE_MAX_TURNS):
+        self.turns: Deque[Dict] = deque(maxlen=max_turns)
+        self.traced = 0
+        self.abandoned = 0  # Turns the candidate resumed speaking in before the bot replied
+        self._current: Optional[Dict[str, int]] = None  # stage -> pipeline clock (ns)
+        self._started_at: Optional[float] = None
+
+    @property
+    def in_turn(self) -> bool:
+        return self._current is not None
+
+    def start(self, timestamp_ns: int):
+        if self._current is not None:
+            self.abandoned += 1
+        self._current = {"vad_stop": timestamp_ns}
+        self._started_at = time.time()
+
+    def marked(self, stage: str) -> bool:
+        return self._current is not None and stage in self._current
+
+    def mark(self, stage: str, timestamp_ns: int, overwrite: bool = False):
+        if self._current is not None and (overwrite or stage not in self._current):
+            self._current[stage] = timestamp_ns
+
+    def cancel(self):
+        """The bot was interrupted or the candidate kept talking: drop the open turn."""
+        if self._current is not None:
+            self.abandoned += 1
+        self._current = None
+
+    def finish(self, timestamp_ns: int) -> Optional[Dict]:
+        if self._current is None:
+            return None
+        self._current["bot_audio_out"] = timestamp_ns
+        origin = self._current["vad_stop"]
+        offsets = {
+            stage: round((self._current[stage] - origin) / 1e6, 1)
+            if stage in self._current
+            else None
+            for stage in STAGES
+        }
+        turn = {"index": self.traced, "at": self._started_at, "ms": offsets}
+        self.turns.append(turn)
+        self.traced += 1
+        self._current = None
+
+        for stage, offset_ms in offsets.items():
+            if offset_ms is not None and stage != "vad_stop":
+                # A transcript final before VAD stopped counts as ready at offset 0
+                pipeline_metrics.turn_stages.observe(max(offset_ms, 0) / 1000, stage=stage)
+        return turn
+
+    def snapshot(self) -> Dict:
+        percentiles = {}
+        for stage in STAGES[1:]:
+            samples = [t["ms"][stage] for t in self.turns if t["ms"][stage] is not None]
+            percentiles[stage] = {
+                "p50": percentile(samples, 50),
+                "p90": percentile(samples, 90),
+                "p99": percentile(samples, 99),
+            }
+        return {
+            "stages": list(STAGES),
+            "turns_traced": self.traced,
+            "abandoned": self.abandoned,
+            "percentiles_ms": percentiles,
+            "turns": list(self.turns),
+        }
@@ -0,0 +1,301 @@
+"""
+Adaptive video quality for the Simli avatar.
+
+Converting and re-encoding Simli's video is the most expensive part of a
+session, and it used to run at a fixed 512x512 for everyone. `VideoGovernor`
+picks each new session's profile from the host load (`load_monitor` CPU and
+event-loop lag): full, reduced or low resolution, or audio-only, where the
+pipeline is built without `SimliVideoService` at all. The transport's video
+track keeps its size for the whole session, so from then on each session's
+`VideoAdapter` only moves the frame rate down (and back up once things
+recover) as the load or the client's WebRTC loss and RTT change. Under
+sustained overload it drops the avatar mid-session: `AdaptiveSimliVideoService`
+closes the Simli session between replies and passes the speech straight
+through, so audio never glitches.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from loguru import logger
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    Frame,
+    OutputImageRawFrame,
+    StartFrame,
+    TTSStartedFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from admission import load_monitor
+from service_pool import WarmSimliVideoService
+
+
+@dataclass(frozen=True)
+class VideoProfile:
+    name: str
+    width: int
+    height: int
+    fps: int
+
+    @property
+    def audio_only(self) -> bool:
+        return self.fps == 0
+
+
+def _even(pixels: float) -> int:
+    # Video encoders want even dimensions
+    return max(2, int(pixels) // 2 * 2)
+
+
+class VideoGovernor:
+    """Chooses video profiles for sessions from host load and connection quality."""
+
+    def __init__(self):
+        self.enabled = os.getenv("VIDEO_ADAPTIVE", "true").lower() == "true"
+        width = int(os.getenv("VIDEO_OUT_WIDTH", 512))
+        height = int(os.getenv("VIDEO_OUT_HEIGHT", 512))
+        fps = int(os.getenv("VIDEO_OUT_FPS", 30))
+        self.profiles = (
+            VideoProfile("full", width, height, fps),
+            VideoProfile("reduced", _even(width * 0.75), _even(height * 0.75), fps * 2 // 3 or 1),
+            VideoProfile("low", _even(width * 0.5), _even(height * 0.5), fps // 2 or 1),
+            VideoProfile("audio_only", 0, 0, 0),
+        )
+        self.degrade_cpu_percent = float(os.getenv("VIDEO_DEGRADE_CPU_PERCENT", 65))
+        self.degrade_loop_lag_ms = float(os.getenv("VIDEO_DEGRADE_LOOP_LAG_MS", 60))
+        self.low_cpu_percent = float(os.getenv("VIDEO_LOW_CPU_PERCENT", 72))
+        self.low_loop_lag_ms = float(os.getenv("VIDEO_LOW_LOOP_LAG_MS", 90))
+        # Below the admission limits, so sessions lose the avatar before offers are refused
+        self.audio_only_cpu_percent = float(os.getenv("VIDEO_AUDIO_ONLY_CPU_PERCENT", 80))
+        self.audio_only_loop_lag_ms = float(os.getenv("VIDEO_AUDIO_ONLY_LOOP_LAG_MS", 120))
+        self.max_packet_loss = float(os.getenv("VIDEO_MAX_PACKET_LOSS", 0.05))
+        self.max_rtt_ms = float(os.getenv("VIDEO_MAX_RTT_MS", 300))
+        self.check_secs = float(os.getenv("VIDEO_ADAPT_CHECK_SECS", 2))
+        self.recover_secs = float(os.getenv("VIDEO_ADAPT_RECOVER_SECS", 20))
+
+        self._adapters: "weakref.WeakSet[VideoAdapter]" = weakref.WeakSet()
+        self.stats = {"step_downs": 0, "step_ups": 0, "avatar_dropped": 0}
+        self.started = {profile.name: 0 for profile in self.profiles}
+
+    def load_floor(self) -> int:
+        """The best profile (index) the host load allows right now."""
+        cpu, lag = load_monitor.cpu_percent, load_monitor.loop_lag_ms
+        if cpu > self.audio_only_cpu_percent or lag > self.audio_only_loop_lag_ms:
+            return len(self.profiles) - 1
+        if cpu > self.low_cpu_percent or lag > self.low_loop_lag_ms:
+            return 2
+        if cpu > self.degrade_cpu_percent or lag > self.degrade_loop_lag_ms:
+            return 1
+        return 0
+
+    def session(self, connection, on_change: Optional[Callable] = None) -> "VideoAdapter":
+        """A new session's adapter, starting at the profile the current load allows."""
+        index = self.load_floor() if self.enabled else 0
+        adapter = VideoAdapter(self, connection, index, on_change)
+        self._adapters.add(adapter)
+        self.started[self.profiles[index].name] += 1
+        if index:
+            logger.info(f"🎥 Session starts with {self.profiles[index].name} video (host load)")
+        return adapter
+
+    def snapshot(self) -> Dict:
+        current = {profile.name: 0 for profile in self.profiles}
+        for adapter in list(self._adapters):
+            if not adapter.closed:
+                current[adapter.profile.name] += 1
+        return {
+            "enabled": self.enabled,
+            "profiles": [
+                {"name": p.name, "width": p.width, "height": p.height, "fps": p.fps}
+                for p in self.profiles
+            ],
+            "load": {
+                "cpu_percent": round(load_monitor.cpu_percent, 1),
+                "loop_lag_ms": round(load_monitor.loop_lag_ms, 1),
+                "floor": self.profiles[self.load_floor()].name,
+            },
+            "sessions": current,
+            "started": self.started,
+            **self.stats,
+        }
+
+
+class VideoAdapter:
+    """One session's video profile, adjusted every few seconds while the avatar runs."""
+
+    def __init__(self, governor: VideoGovernor, connection, index: int, on_change=None):
+        self.governor = governor
+        self.connection = connection
+        self.index = index
+        # Output size of the transport's video track, fixed for the session
+        self.resolution = governor.profiles[index]
+        self.on_change = on_change
+        self.packet_loss: Optional[float] = None
+        self.rtt_ms: Optional[float] = None
+        self._network_index = 0
+        self._network_bad_at = 0.0
+        self._overloaded_checks = 0
+        self._pressured_at = time.monotonic()
+
+    @property
+    def profile(self) -> VideoProfile:
+        return self.governor.profiles[self.index]
+
+    @property
+    def audio_only(self) -> bool:
+        return self.profile.audio_only
+
+    @property
+    def closed(self) -> bool:
+        return self.connection.pc.connectionState in ("closed", "failed")
+
+    async def run(self):
+        while not self.audio_only:
+            await asyncio.sleep(self.governor.check_secs)
+            await self.check()
+
+    async def check(self):
+        governor = self.governor
+        if not governor.enabled:
+            return
+        now = time.monotonic()
+        last = len(governor.profiles) - 1
+
+        # A lossy or slow client connection only costs frame rate, never the avatar
+        if await self._network_degraded():
+            self._network_index = min(self._network_index + 1, last - 1)
+            self._network_bad_at = now
+        elif self._network_index and now - self._network_bad_at >= governor.recover_secs:
+            self._network_index -= 1
+            self._network_bad_at = now
+        target = max(governor.load_floor(), self._network_index)
+
+        # Audio-only only on sustained overload, not on one slow tick
+        self._overloaded_checks = self._overloaded_checks + 1 if target == last else 0
+        if target == last and self._overloaded_checks < 2:
+            target = last - 1
+
+        if target >= self.index:
+            self._pressured_at = now
+        if target > self.index:
+            governor.stats["step_downs"] += 1
+            if target == last:
+                governor.stats["avatar_dropped"] += 1
+            self._set(target)
+        elif target < self.index and now - self._pressured_at >= governor.recover_secs:
+            # Recover one step at a time
+            self._pressured_at = now
+            governor.stats["step_ups"] += 1
+            self._set(self.index - 1)
+
+    def _set(self, index: int):
+        previous, self.index = self.profile, index
+        logger.info(
+            f"🎥 Video {previous.name} -> {self.profile.name} "
+            f"(cpu {load_monitor.cpu_percent:.0f}%, lag {load_monitor.loop_lag_ms:.0f}ms, "
+            f"loss {self.packet_loss}, rtt {self.rtt_ms}ms)"
+        )
+        # Audio-only is announced by the avatar service once Simli has actually stopped
+        if not self.audio_only:
+            self.notify()
+
+    def notify(self):
+        """Tell the session about its current profile."""
+        if self.on_change:
+            self.on_change(self.profile)
+
+    async def _network_degraded(self) -> bool:
+        """Whether the client reports heavy loss or a long round trip on our video."""
+        try:
+            report = await self.connection.pc.getStats()
+        except Exception as e:
+            logger.debug(f"Could not read WebRTC stats: {e}")
+            return False
+        for stats in report.values():
+            if stats.type == "remote-inbound-rtp" and stats.kind == "video":
+                # RTCP receiver reports carry the loss fraction in 1/256ths
+                self.packet_loss = round(stats.fractionLost / 256, 3)
+                self.rtt_ms = round(stats.roundTripTime * 1000) if stats.roundTripTime else None
+                return self.packet_loss > self.governor.max_packet_loss or (
+                    self.rtt_ms is not None and self.rtt_ms > self.governor.max_rtt_ms
+                )
+        return False
+
+
+class AdaptiveSimliVideoService(WarmSimliVideoService):
+    """Simli avatar that follows its session's `VideoAdapter`."""
+
+    def __init__(self, *, adapter: VideoAdapter, **kwargs):
+        super().__init__(**kwargs)
+        self._adapter = adapter
+        self._adapter_task: Optional[asyncio.Task] = None
+        self._bot_speaking = False
+        self._avatar_dropped = False
+
+    async def _consume_and_process_video(self):
+        await self._pipecat_resampler_event.wait()
+        width, height = self._adapter.resolution.width, self._adapter.resolution.height
+        next_frame_at = 0.0
+        video_iterator = self._simli_client.getVideoStreamIterator(targetFormat="rgb24")
+        async for video_frame in video_iterator:
+            profile = self._adapter.profile
+            if profile.audio_only:
+                continue
+            # Skip frames above the profile's rate before paying for the conversion
+            now = time.monotonic()
+            if now < next_frame_at:
+                continue
+            next_frame_at = max(next_frame_at + 1 / profile.fps, now - 1 / profile.fps)
+
+            # Scale in the same pass as the RGB conversion, so the transport never resizes
+            rgb = video_frame.reformat(width=width, height=height, format="rgb24")
+            frame = OutputImageRawFrame(
+                image=rgb.to_ndarray().tobytes(), size=(width, height), format="RGB"
+            )
+            frame.pts = video_frame.pts
+            await self.push_frame(frame)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        if self._avatar_dropped:
+            # Simli is closed: speech goes straight to the transport
+            await FrameProcessor.process_frame(self, frame, direction)
+            await self.push_frame(frame, direction)
+            return
+
+        if isinstance(frame, BotStartedSpeakingFrame):
+            self._bot_speaking = True
+        elif isinstance(frame, BotStoppedSpeakingFrame):
+            self._bot_speaking = False
+        if isinstance(frame, (BotStoppedSpeakingFrame, TTSStartedFrame)):
+            # Only switch between replies, never with speech still inside Simli
+            if self._adapter.audio_only and not self._bot_speaking:
+                await self._drop_avatar()
+                await FrameProcessor.process_frame(self, frame, direction)
+                await self.push_frame(frame, direction)
+                return
+
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartFrame) and self._adapter_task is None:
+            self._adapter_task = self.create_task(self._adapter.run())
+
+    async def _drop_avatar(self):
+        logger.info("🎥 Dropping the avatar for the rest of the session (host overloaded)")
+        self._avatar_dropped = True
+        await self._stop()
+        self._adapter.notify()
+
+    async def _stop(self):
+        if self._adapter_task:
+            await self.cancel_task(self._adapter_task)
+            self._adapter_task = None
+        await super()._stop()
+
+
+# Process-wide governor
+video_governor = VideoGovernor()